@@ -0,0 +1,42 @@
+"""
+build_kernels.py — Ahead-of-time compile the stitch blend kernel.
+
+Numba's JIT cache (cache=True) already avoids recompiling on every run, but
+the first run per machine still pays the compile cost and the JIT path needs
+numba installed at runtime. This script compiles the fused blend/fill kernel
+into a native extension module (stitch_kernels) next to stitch.py, which
+stitch.py imports when present.
+
+Building requires numba (only the compiled module is numba-free) and uses
+numba.pycc, which numba has marked as pending deprecation.
+
+Usage:
+    python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+import stitch
+
+# (canvas, warped, bx0, alpha, both, r_only, fill_start, fill_mask)
+BLEND_FILL_SIGNATURE = "void(u1[:,:,:], u1[:,:,:], i8, u2[:], b1[:,:], b1[:,:], i8, b1[:,:])"
+
+
+def main():
+    if not stitch.NUMBA_AVAILABLE:
+        raise RuntimeError("numba is required to build the AOT kernels")
+
+    cc = CC("stitch_kernels")
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    # AOT modules cannot use parallel=True, so prange compiles as range
+    cc.export("blend_fill", BLEND_FILL_SIGNATURE)(stitch._blend_fill_kernel.py_func)
+    cc.compile()
+    print(f"Built stitch_kernels in {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -97,11 +97,19 @@ class CropState:
 class InteractiveViewer:
     """Main interactive viewer application."""
 
-    def __init__(self, video_path: str, config: dict = None):
+    def __init__(self, video_path: str, config: dict = None, capture=None):
+        """
+        Args:
+            video_path: Stitched panoramic video.
+            config: Optional settings (controller mapping, speeds, teams).
+            capture: Already-open cv2.VideoCapture-like source to use instead
+                of opening video_path (e.g. an in-memory source for tests).
+        """
         self.video_path = video_path
         self.config = config or {}
 
         # Video
+        self.capture = capture
         self.cap = None
         self.pano_width = 0
         self.pano_height = 0
@@ -170,7 +178,10 @@ class InteractiveViewer:
 
     def open_video(self):
         """Open the video file and read metadata."""
-        self.cap = cv2.VideoCapture(self.video_path)
+        if self.capture is not None:
+            self.cap = self.capture
+        else:
+            self.cap = cv2.VideoCapture(self.video_path)
         if not self.cap.isOpened():
             raise FileNotFoundError(f"Cannot open video: {self.video_path}")
 
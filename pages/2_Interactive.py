@@ -34,13 +34,23 @@ def open_file_dialog(title="Select File", filetypes=None):
     return path if path else None
 
 
-def get_session_summary(log_path):
-    """Parse a session log and return summary stats."""
-    if not os.path.exists(log_path):
-        return None
+def get_session_summary(source):
+    """
+    Parse a session log and return summary stats.
+
+    source is a log path or an open text file-like object; for the latter
+    "log_path" in the summary is None.
+    """
+    if hasattr(source, "read"):
+        log_path = None
+        rows = list(csv.DictReader(source))
+    else:
+        log_path = source
+        if not os.path.exists(log_path):
+            return None
 
-    with open(log_path) as f:
-        rows = list(csv.DictReader(f))
+        with open(log_path) as f:
+            rows = list(csv.DictReader(f))
 
     if not rows:
         return None
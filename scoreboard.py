@@ -71,6 +71,10 @@ class ScoreboardRenderer:
         # Cache
         self._cache_state = None
         self._cache_image = None
+        self._static_key = None
+        self._static_bar = None
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _find_font(self, name: str) -> str:
         """Search for a font file in common locations."""
@@ -97,27 +101,21 @@ class ScoreboardRenderer:
         bbox = font.getbbox(text)
         return bbox[2] - bbox[0], bbox[3] - bbox[1]
 
-    def render(self, state: ScoreboardState) -> Image.Image:
+    def _render_static_bar(self, state: ScoreboardState):
         """
-        Render the scoreboard overlay as a transparent RGBA image.
+        Draw the parts of the bar that only depend on team names and colors.
+
+        Scores, clock and half text are left off so render() can draw them
+        onto a copy; the layer is rebuilt only when a team or color changes.
 
         Returns:
-            PIL Image (RGBA) at frame_width x frame_height with scoreboard drawn.
+            (bar_img, layout) where layout holds the x positions render()
+            needs to place the dynamic text.
         """
-        if not state.visible:
-            return Image.new("RGBA", (self.frame_width, self.frame_height), (0, 0, 0, 0))
-
-        # Check cache
-        cache_key = (
-            state.home_team, state.away_team, state.home_score, state.away_score,
-            state.clock_seconds, state.half, state.visible,
-            state.home_color, state.away_color, state.position, state.offset
-        )
-        if cache_key == self._cache_state and self._cache_image is not None:
-            return self._cache_image
-
-        # Create transparent canvas
-        img = Image.new("RGBA", (self.frame_width, self.frame_height), (0, 0, 0, 0))
+        static_key = (state.home_team, state.away_team,
+                      state.home_color, state.away_color)
+        if static_key == self._static_key and self._static_bar is not None:
+            return self._static_bar
 
         # Calculate bar width based on team name lengths
         home_name_w, _ = self._measure_text(state.home_team.upper(), self.font_team_name)
@@ -134,13 +132,6 @@ class ScoreboardRenderer:
         bar_width = max(self.min_bar_width,
                         home_section_w + timer_section_w + away_section_w)
 
-        # Position the bar
-        bar_x = (self.frame_width - bar_width) // 2
-        if state.position == "top":
-            bar_y = state.offset
-        else:
-            bar_y = self.frame_height - self.bar_height - state.offset
-
         # Draw bar on a sub-image for rounded corners
         bar_img = Image.new("RGBA", (bar_width, self.bar_height), (0, 0, 0, 0))
         bar_draw = ImageDraw.Draw(bar_img)
@@ -156,7 +147,6 @@ class ScoreboardRenderer:
 
         # === HOME SECTION ===
         home_rgb = hex_to_rgb(state.home_color)
-        home_dark = darken_color(home_rgb, 0.7)
 
         # Home background (team color)
         home_end_x = home_section_w
@@ -201,15 +191,6 @@ class ScoreboardRenderer:
         bar_draw.line([(score_box_x, 2), (score_box_x, self.bar_height - 3)],
                       fill=(51, 51, 51, 255), width=2)
 
-        score_text = str(state.home_score)
-        sw, sh = self._measure_text(score_text, self.font_score)
-        score_x = score_box_x + (score_section_w - sw) // 2
-        score_y = (self.bar_height - sh) // 2 - 4
-        bar_draw.text((score_x + 2, score_y + 2), score_text,
-                      fill=(0, 0, 0, 200), font=self.font_score)
-        bar_draw.text((score_x, score_y), score_text,
-                      fill=(255, 255, 255, 255), font=self.font_score)
-
         # === TIMER SECTION ===
         timer_x = home_end_x
         timer_end_x = timer_x + timer_section_w
@@ -223,27 +204,6 @@ class ScoreboardRenderer:
         bar_draw.line([(timer_end_x, 2), (timer_end_x, self.bar_height - 3)],
                       fill=(85, 85, 85, 255), width=2)
 
-        # Clock text
-        minutes = state.clock_seconds // 60
-        seconds = state.clock_seconds % 60
-        clock_text = f"{minutes:02d}:{seconds:02d}"
-        cw, ch = self._measure_text(clock_text, self.font_timer)
-        clock_x = timer_x + (timer_section_w - cw) // 2
-        clock_y = (self.bar_height - ch) // 2 - 8
-        # Gold timer text with shadow
-        bar_draw.text((clock_x + 2, clock_y + 2), clock_text,
-                      fill=(0, 0, 0, 200), font=self.font_timer)
-        bar_draw.text((clock_x, clock_y), clock_text,
-                      fill=(255, 215, 0, 255), font=self.font_timer)  # #FFD700
-
-        # Half indicator
-        half_text = "1ST HALF" if state.half == 1 else "2ND HALF"
-        hw, hh = self._measure_text(half_text, self.font_half)
-        half_x = timer_x + (timer_section_w - hw) // 2
-        half_y = clock_y + ch + 4
-        bar_draw.text((half_x, half_y), half_text,
-                      fill=(170, 170, 170, 255), font=self.font_half)  # #AAA
-
         # === AWAY SECTION ===
         away_rgb = hex_to_rgb(state.away_color)
         away_start_x = timer_end_x
@@ -264,15 +224,6 @@ class ScoreboardRenderer:
         bar_draw.line([(away_score_end_x, 2), (away_score_end_x, self.bar_height - 3)],
                       fill=(51, 51, 51, 255), width=2)
 
-        away_score_text = str(state.away_score)
-        asw, ash = self._measure_text(away_score_text, self.font_score)
-        away_score_x = away_start_x + (score_section_w - asw) // 2
-        away_score_y = (self.bar_height - ash) // 2 - 4
-        bar_draw.text((away_score_x + 2, away_score_y + 2), away_score_text,
-                      fill=(0, 0, 0, 200), font=self.font_score)
-        bar_draw.text((away_score_x, away_score_y), away_score_text,
-                      fill=(255, 255, 255, 255), font=self.font_score)
-
         # Away team name
         away_name_x = away_score_end_x + 10
         bar_draw.text((away_name_x + 2, name_y + 2), state.away_team.upper(),
@@ -294,7 +245,96 @@ class ScoreboardRenderer:
             away_initial, fill=(255, 255, 255, 255), font=self.font_logo
         )
 
-        # Paste bar onto main canvas
+        layout = {
+            "score_section_w": score_section_w,
+            "timer_section_w": timer_section_w,
+            "home_score_x": score_box_x,
+            "timer_x": timer_x,
+            "away_score_x": away_start_x,
+        }
+        self._static_key = static_key
+        self._static_bar = (bar_img, layout)
+        return self._static_bar
+
+    def render(self, state: ScoreboardState) -> Image.Image:
+        """
+        Render the scoreboard overlay as a transparent RGBA image.
+
+        Returns:
+            PIL Image (RGBA) at frame_width x frame_height with scoreboard drawn.
+        """
+        if not state.visible:
+            return Image.new("RGBA", (self.frame_width, self.frame_height), (0, 0, 0, 0))
+
+        # Check cache
+        cache_key = (
+            state.home_team, state.away_team, state.home_score, state.away_score,
+            state.clock_seconds, state.half, state.visible,
+            state.home_color, state.away_color, state.position, state.offset
+        )
+        if cache_key == self._cache_state and self._cache_image is not None:
+            self.cache_hits += 1
+            return self._cache_image
+        self.cache_misses += 1
+
+        static_bar, layout = self._render_static_bar(state)
+        bar_img = static_bar.copy()
+        bar_draw = ImageDraw.Draw(bar_img)
+        score_section_w = layout["score_section_w"]
+        timer_section_w = layout["timer_section_w"]
+
+        # Home score
+        score_text = str(state.home_score)
+        sw, sh = self._measure_text(score_text, self.font_score)
+        score_x = layout["home_score_x"] + (score_section_w - sw) // 2
+        score_y = (self.bar_height - sh) // 2 - 4
+        bar_draw.text((score_x + 2, score_y + 2), score_text,
+                      fill=(0, 0, 0, 200), font=self.font_score)
+        bar_draw.text((score_x, score_y), score_text,
+                      fill=(255, 255, 255, 255), font=self.font_score)
+
+        # Clock text
+        timer_x = layout["timer_x"]
+        minutes = state.clock_seconds // 60
+        seconds = state.clock_seconds % 60
+        clock_text = f"{minutes:02d}:{seconds:02d}"
+        cw, ch = self._measure_text(clock_text, self.font_timer)
+        clock_x = timer_x + (timer_section_w - cw) // 2
+        clock_y = (self.bar_height - ch) // 2 - 8
+        # Gold timer text with shadow
+        bar_draw.text((clock_x + 2, clock_y + 2), clock_text,
+                      fill=(0, 0, 0, 200), font=self.font_timer)
+        bar_draw.text((clock_x, clock_y), clock_text,
+                      fill=(255, 215, 0, 255), font=self.font_timer)  # #FFD700
+
+        # Half indicator
+        half_text = "1ST HALF" if state.half == 1 else "2ND HALF"
+        hw, hh = self._measure_text(half_text, self.font_half)
+        half_x = timer_x + (timer_section_w - hw) // 2
+        half_y = clock_y + ch + 4
+        bar_draw.text((half_x, half_y), half_text,
+                      fill=(170, 170, 170, 255), font=self.font_half)  # #AAA
+
+        # Away score
+        away_score_text = str(state.away_score)
+        asw, ash = self._measure_text(away_score_text, self.font_score)
+        away_score_x = layout["away_score_x"] + (score_section_w - asw) // 2
+        away_score_y = (self.bar_height - ash) // 2 - 4
+        bar_draw.text((away_score_x + 2, away_score_y + 2), away_score_text,
+                      fill=(0, 0, 0, 200), font=self.font_score)
+        bar_draw.text((away_score_x, away_score_y), away_score_text,
+                      fill=(255, 255, 255, 255), font=self.font_score)
+
+        # Position the bar
+        bar_width = bar_img.width
+        bar_x = (self.frame_width - bar_width) // 2
+        if state.position == "top":
+            bar_y = state.offset
+        else:
+            bar_y = self.frame_height - self.bar_height - state.offset
+
+        # Paste bar onto transparent canvas
+        img = Image.new("RGBA", (self.frame_width, self.frame_height), (0, 0, 0, 0))
         img.paste(bar_img, (bar_x, bar_y), bar_img)
 
         # Update cache
@@ -7,6 +7,9 @@ smooth snap-to-position animations for the crop window.
 
 import time
 
+import numpy as np
+from scipy.signal import lfilter
+
 
 class ExponentialSmoother:
     """
@@ -32,6 +35,29 @@ class ExponentialSmoother:
         self.value = self.alpha * raw_input + (1 - self.alpha) * self.value
         return self.value
 
+    def filter(self, raw_inputs: np.ndarray) -> np.ndarray:
+        """
+        Smooth a whole block of inputs at once.
+
+        Equivalent to calling update() on each value in turn, but runs the
+        recurrence as a single IIR filter. The smoother's state is advanced
+        to the last output, so streaming updates can continue afterwards.
+
+        Args:
+            raw_inputs: 1-D array of raw input values.
+
+        Returns:
+            Array of smoothed outputs, one per input.
+        """
+        raw_inputs = np.asarray(raw_inputs, dtype=np.float64)
+        if raw_inputs.size == 0:
+            return raw_inputs
+        decay = 1 - self.alpha
+        smoothed, _ = lfilter([self.alpha], [1.0, -decay], raw_inputs,
+                              zi=[decay * self.value])
+        self.value = float(smoothed[-1])
+        return smoothed
+
     def reset(self, value: float = 0.0):
         """Reset the smoother to a specific value."""
         self.value = value
@@ -11,10 +11,16 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import os
+import queue
+import re
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
 
 import cv2
@@ -22,6 +28,47 @@ import numpy as np
 
 from calibrate import calibrate, extract_frame
 
+# Numba is optional: without it the blend falls back to vectorized NumPy
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Ahead-of-time build of the blend kernel (python build_kernels.py). Used
+# when numba itself is not installed; needs no compilation at startup.
+try:
+    import stitch_kernels
+    AOT_KERNELS_AVAILABLE = True
+except ImportError:
+    AOT_KERNELS_AVAILABLE = False
+
+# Frames buffered between the decode, stitch, and encode stages. Bounds
+# memory to roughly 2 * PIPELINE_DEPTH frame pairs/panoramas in flight.
+PIPELINE_DEPTH = 8
+
+# open_capture() sets this around each FFmpeg open; the lock keeps
+# concurrent opens from restoring each other's value
+_CAPTURE_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_CAPTURE_OPTIONS_LOCK = threading.Lock()
+
+# HH:MM:SS:FF, drop-frame HH:MM:SS;FF, or HH:MM:SS.mmm
+_TIMECODE_RE = re.compile(r"^(\d+)[:;](\d+)[:;](\d+(?:\.\d+)?)(?:[:;](\d+))?$")
+
+
+def timecode_to_seconds(tc_str: str, fps: float = 30.0) -> float | None:
+    """Convert HH:MM:SS:FF or HH:MM:SS.mmm to seconds (None if malformed)."""
+    match = _TIMECODE_RE.match(tc_str)
+    if match is None:
+        return None
+
+    h, m, s, f = match.groups()
+    if f is not None:
+        if "." in s:
+            return None
+        return int(h) * 3600 + int(m) * 60 + int(s) + int(f) / fps
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
 
 def detect_timecode_offset(left_path: str, right_path: str) -> float | None:
     """
@@ -57,18 +104,6 @@ def detect_timecode_offset(left_path: str, right_path: str) -> float | None:
         except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
             return None
 
-    def timecode_to_seconds(tc_str: str, fps: float = 30.0) -> float:
-        """Convert HH:MM:SS:FF or HH:MM:SS.mmm to seconds."""
-        parts = tc_str.replace(";", ":").split(":")
-        if len(parts) == 4:
-            h, m, s, f = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
-            return h * 3600 + m * 60 + s + f / fps
-        elif len(parts) == 3:
-            h, m = int(parts[0]), int(parts[1])
-            s = float(parts[2])
-            return h * 3600 + m * 60 + s
-        return None
-
     tc_left = get_timecode(left_path)
     tc_right = get_timecode(right_path)
 
@@ -84,9 +119,100 @@ def detect_timecode_offset(left_path: str, right_path: str) -> float | None:
     return sec_right - sec_left
 
 
+def open_capture(path: str) -> cv2.VideoCapture:
+    """
+    Open a video with the FFmpeg backend and multithreaded decoding.
+
+    Each capture gets its own libavcodec pool of os.cpu_count() decode
+    threads. OpenCV only takes that setting from the
+    OPENCV_FFMPEG_CAPTURE_OPTIONS environment variable, read when the
+    capture opens, so the variable is set just for this open and then
+    removed again; the rest of the process never sees it. A value the user
+    set before launching wins and is left untouched.
+    """
+    threads = os.cpu_count() or 1
+    with _CAPTURE_OPTIONS_LOCK:
+        user_options = os.environ.get(_CAPTURE_OPTIONS_ENV)
+        if user_options is None:
+            os.environ[_CAPTURE_OPTIONS_ENV] = f"threads;{threads}"
+        try:
+            cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+        finally:
+            if user_options is None:
+                del os.environ[_CAPTURE_OPTIONS_ENV]
+
+    if not cap.isOpened():
+        # OpenCV built without FFmpeg: let it pick any backend
+        cap = cv2.VideoCapture(path)
+    if cap.isOpened():
+        cap.set(cv2.CAP_PROP_N_THREADS, threads)
+    return cap
+
+
+def open_writer(output_path: str, fps: float,
+                frame_size: tuple) -> cv2.VideoWriter:
+    """
+    Open the stitched-video writer, preferring a hardware H.264 encoder.
+
+    NVENC/VA-API/QSV are tried through OpenCV's FFmpeg backend. Without a
+    usable device this falls back to MJPG, since mp4v has a 4096px
+    dimension limit and OpenH264 is often unavailable; the final render
+    stage re-encodes to H.264 anyway.
+    """
+    if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+        writer = cv2.VideoWriter(
+            output_path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*"avc1"),
+            fps, frame_size,
+            [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if (writer.isOpened() and
+                writer.get(cv2.VIDEOWRITER_PROP_HW_ACCELERATION)
+                > cv2.VIDEO_ACCELERATION_NONE):
+            print("Encoding with hardware-accelerated H.264")
+            return writer
+        writer.release()
+
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"MJPG"),
+                           fps, frame_size)
+
+
+def output_frame_size(canvas_width: int, canvas_height: int) -> tuple:
+    """
+    Frame size of the stitched video for a calibration canvas.
+
+    Both output codecs (H.264, MJPG) store 4:2:0 chroma, which needs even
+    dimensions, so an odd canvas drops its last column and/or row. Stitching
+    at this size keeps the file's dimensions exact instead of leaving the
+    rounding to the encoder.
+
+    Returns:
+        (width, height), each rounded down to an even number.
+    """
+    return canvas_width & ~1, canvas_height & ~1
+
+
 def get_video_info(path: str) -> dict:
-    """Get video metadata using OpenCV."""
-    cap = cv2.VideoCapture(path)
+    """
+    Get video metadata using OpenCV.
+
+    Results are cached per (path, mtime, size), so repeated lookups of an
+    unchanged file (e.g. on every Streamlit rerun) skip reopening the
+    container; a rewritten file is probed again.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _probe_video_info(path)  # Raises with the usual message
+    return dict(_cached_video_info(path, st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_video_info(path: str, mtime_ns: int, size: int) -> dict:
+    return _probe_video_info(path)
+
+
+def _probe_video_info(path: str) -> dict:
+    cap = open_capture(path)
     if not cap.isOpened():
         raise FileNotFoundError(f"Cannot open video: {path}")
 
@@ -100,12 +226,88 @@ def get_video_info(path: str) -> dict:
     return info
 
 
+def skip_frames(cap: cv2.VideoCapture, count: int):
+    """
+    Advance a capture past its first `count` frames without decoding them.
+
+    Seeks directly when the backend lands exactly on the requested frame;
+    otherwise rewinds and steps with grab(), which demuxes but never decodes
+    or copies pixels.
+    """
+    if count <= 0:
+        return
+    if cap.set(cv2.CAP_PROP_POS_FRAMES, count) and \
+            int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == count:
+        return
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for _ in range(count):
+        if not cap.grab():
+            break
+
+
 def load_calibration(cal_path: str) -> dict:
     """Load calibration data from JSON file."""
     with open(cal_path) as f:
         return json.load(f)
 
 
+def left_placement(canvas_width: int, canvas_height: int,
+                   offset_x: int, offset_y: int,
+                   left_height: int, left_width: int) -> tuple:
+    """
+    Clip the left frame's placement to the canvas.
+
+    Returns:
+        (y_start, y_end, x_start, x_end, src_y_start, src_y_end,
+        src_x_start, src_x_end): canvas rows/cols covered by the left frame
+        and the matching rows/cols of the frame itself.
+    """
+    left_x = -offset_x
+    left_y = -offset_y
+    y_start = max(0, left_y)
+    y_end = min(canvas_height, left_y + left_height)
+    x_start = max(0, left_x)
+    x_end = min(canvas_width, left_x + left_width)
+    return (y_start, y_end, x_start, x_end,
+            y_start - left_y, y_end - left_y,
+            x_start - left_x, x_end - left_x)
+
+
+def _placement_slices(placement: tuple) -> tuple:
+    """Turn a left_placement() tuple into (canvas_slice, frame_slice)."""
+    y_s, y_e, x_s, x_e, sy_s, sy_e, sx_s, sx_e = placement
+    return ((slice(y_s, y_e), slice(x_s, x_e)),
+            (slice(sy_s, sy_e), slice(sx_s, sx_e)))
+
+
+def _alpha_fixed(alpha: np.ndarray) -> np.ndarray:
+    """Quantize blend weights in [0, 1] to 8.8 fixed point (0..256, uint16)."""
+    return np.round(alpha * 256).astype(np.uint16)
+
+
+def _blend_fixed(left: np.ndarray, right: np.ndarray,
+                 alpha_q: np.ndarray) -> np.ndarray:
+    """
+    Linear blend (1 - a) * left + a * right of uint8 images in integer math.
+
+    Products stay below 2**16, so the whole blend runs on uint16 lanes with
+    a rounding shift instead of float32 multiplies.
+    """
+    left = left.astype(np.uint16)
+    right = right.astype(np.uint16)
+    return ((left * (256 - alpha_q) + right * alpha_q + 128) >> 8).astype(np.uint8)
+
+
+def _channel_max(image: np.ndarray) -> np.ndarray:
+    """
+    Per-pixel max over the three BGR channels, staying in uint8.
+
+    Nonzero exactly where sum(axis=2) would be, without promoting to int64.
+    """
+    return np.maximum(np.maximum(image[:, :, 0], image[:, :, 1]), image[:, :, 2])
+
+
 def stitch_frame(frame_left: np.ndarray, frame_right: np.ndarray,
                  H_adjusted: np.ndarray, canvas_width: int, canvas_height: int,
                  offset_x: int, offset_y: int,
@@ -133,23 +335,10 @@ def stitch_frame(frame_left: np.ndarray, frame_right: np.ndarray,
 
     # Place left image on canvas
     canvas = np.zeros((canvas_height, canvas_width, 3), dtype=np.uint8)
-    left_x = -offset_x
-    left_y = -offset_y
-    h_left, w_left = frame_left.shape[:2]
-
-    # Compute valid placement region
-    y_start = max(0, left_y)
-    y_end = min(canvas_height, left_y + h_left)
-    x_start = max(0, left_x)
-    x_end = min(canvas_width, left_x + w_left)
-
-    src_y_start = y_start - left_y
-    src_y_end = y_end - left_y
-    src_x_start = x_start - left_x
-    src_x_end = x_end - left_x
-
-    canvas[y_start:y_end, x_start:x_end] = \
-        frame_left[src_y_start:src_y_end, src_x_start:src_x_end]
+    dst_slice, src_slice = _placement_slices(
+        left_placement(canvas_width, canvas_height, offset_x, offset_y,
+                       *frame_left.shape[:2]))
+    canvas[dst_slice] = frame_left[src_slice]
 
     # Linear blend in overlap region (vectorized)
     bx0 = max(blend_x_start, 0)
@@ -163,26 +352,26 @@ def stitch_frame(frame_left: np.ndarray, frame_right: np.ndarray,
         alpha = np.linspace(alpha_start, alpha_end, blend_slice_w,
                             dtype=np.float32).reshape(1, -1, 1)
 
-        left_region = canvas[:, bx0:bx1].astype(np.float32)
-        right_region = warped_right[:, bx0:bx1].astype(np.float32)
-
-        left_has = left_region.sum(axis=2, keepdims=True) > 0
-        right_has = right_region.sum(axis=2, keepdims=True) > 0
+        left_has = (_channel_max(canvas[:, bx0:bx1]) > 0)[:, :, np.newaxis]
+        right_has = (_channel_max(warped_right[:, bx0:bx1]) > 0)[:, :, np.newaxis]
         both = left_has & right_has
 
-        blended = left_region.copy()
+        left_region = canvas[:, bx0:bx1]
+        right_region = warped_right[:, bx0:bx1]
+
         blended = np.where(both,
-                           (1 - alpha) * left_region + alpha * right_region,
-                           blended)
+                           _blend_fixed(left_region, right_region,
+                                        _alpha_fixed(alpha)),
+                           left_region)
         blended = np.where(~left_has & right_has, right_region, blended)
-        canvas[:, bx0:bx1] = blended.astype(np.uint8)
+        canvas[:, bx0:bx1] = blended
 
     # Fill remaining right-only region (only check past the blend zone)
     fill_start = max(bx1 if bx0 < bx1 else blend_x_end, 0)
     if fill_start < canvas_width:
         c_slice = canvas[:, fill_start:]
         w_slice = warped_right[:, fill_start:]
-        right_only = (c_slice.sum(axis=2) == 0) & (w_slice.sum(axis=2) > 0)
+        right_only = (_channel_max(c_slice) == 0) & (_channel_max(w_slice) > 0)
         c_slice[right_only] = w_slice[right_only]
 
     return canvas
@@ -200,31 +389,24 @@ def precompute_remap(H_adjusted: np.ndarray,
     Call once before the frame loop. The returned dict is passed to
     stitch_frame_remap() for each frame.
     """
-    # Inverse homography for remap: canvas coords → right-image coords
-    H_inv = np.linalg.inv(H_adjusted).astype(np.float64)
+    # Inverse homography for remap: canvas coords → right-image coords.
+    # Invert in float64, then evaluate the grids in float32: the maps are
+    # stored as float32 anyway and the error stays around 1/500 px
+    H_inv = np.linalg.inv(np.asarray(H_adjusted, dtype=np.float64)).astype(np.float32)
 
-    # Build coordinate grid for the full canvas
-    xs = np.arange(canvas_width, dtype=np.float64)
-    ys = np.arange(canvas_height, dtype=np.float64)
-    grid_x, grid_y = np.meshgrid(xs, ys)
+    # Canvas coordinates as a row and a column vector; broadcasting expands
+    # them per term instead of materializing two full meshgrids
+    xs = np.arange(canvas_width, dtype=np.float32)[np.newaxis, :]
+    ys = np.arange(canvas_height, dtype=np.float32)[:, np.newaxis]
 
-    denom = H_inv[2, 0] * grid_x + H_inv[2, 1] * grid_y + H_inv[2, 2]
-    remap_x = ((H_inv[0, 0] * grid_x + H_inv[0, 1] * grid_y + H_inv[0, 2])
-               / denom).astype(np.float32)
-    remap_y = ((H_inv[1, 0] * grid_x + H_inv[1, 1] * grid_y + H_inv[1, 2])
-               / denom).astype(np.float32)
+    denom = H_inv[2, 0] * xs + H_inv[2, 1] * ys + H_inv[2, 2]
+    remap_x = (H_inv[0, 0] * xs + H_inv[0, 1] * ys + H_inv[0, 2]) / denom
+    remap_y = (H_inv[1, 0] * xs + H_inv[1, 1] * ys + H_inv[1, 2]) / denom
 
     # Left-image placement coordinates
-    left_x = -offset_x
-    left_y = -offset_y
-    y_start = max(0, left_y)
-    y_end = min(canvas_height, left_y + left_height)
-    x_start = max(0, left_x)
-    x_end = min(canvas_width, left_x + left_width)
-    src_y_start = y_start - left_y
-    src_y_end = y_end - left_y
-    src_x_start = x_start - left_x
-    src_x_end = x_end - left_x
+    placement = left_placement(canvas_width, canvas_height, offset_x, offset_y,
+                               left_height, left_width)
+    y_start, y_end, x_start, x_end = placement[:4]
 
     # Static right-valid mask: warp a white image once to find valid pixels
     white = np.full((right_height, right_width), 255, dtype=np.uint8)
@@ -241,6 +423,7 @@ def precompute_remap(H_adjusted: np.ndarray,
     bx1 = min(blend_x_end, canvas_width)
 
     alpha_mask = None
+    alpha_fixed = None
     blend_both = None
     blend_right_only = None
 
@@ -251,6 +434,7 @@ def precompute_remap(H_adjusted: np.ndarray,
         alpha_end = (bx1 - 1 - blend_x_start) / max(blend_w - 1, 1)
         alpha_mask = np.linspace(alpha_start, alpha_end, blend_slice_w,
                                  dtype=np.float32).reshape(1, -1, 1)
+        alpha_fixed = _alpha_fixed(alpha_mask)
 
         bl = left_valid[:, bx0:bx1]
         br = right_valid[:, bx0:bx1]
@@ -265,68 +449,418 @@ def precompute_remap(H_adjusted: np.ndarray,
         fill_left = left_valid[:, fill_start:]
         fill_mask = fill_right & ~fill_left
 
+    # Tight box around the right pixels the blend and fill actually read;
+    # only this ROI is remapped per frame
+    right_used = np.zeros((canvas_height, canvas_width), dtype=bool)
+    if blend_both is not None:
+        right_used[:, bx0:bx1] = br
+    if fill_mask is not None:
+        right_used[:, fill_start:] |= fill_mask
+    used_rows = np.flatnonzero(right_used.any(axis=1))
+    used_cols = np.flatnonzero(right_used.any(axis=0))
+    if used_rows.size:
+        warp_roi = (slice(int(used_rows[0]), int(used_rows[-1]) + 1),
+                    slice(int(used_cols[0]), int(used_cols[-1]) + 1))
+    else:
+        warp_roi = (slice(0, 0), slice(0, 0))
+
+    # Flattened 2-D masks for the fused Numba kernel
+    blend_kernel_args = (
+        bx0,
+        alpha_fixed.ravel() if alpha_fixed is not None
+        else np.empty(0, dtype=np.uint16),
+        np.ascontiguousarray(blend_both[:, :, 0]) if blend_both is not None
+        else np.empty((canvas_height, 0), dtype=bool),
+        np.ascontiguousarray(blend_right_only[:, :, 0])
+        if blend_right_only is not None
+        else np.empty((canvas_height, 0), dtype=bool),
+        fill_start,
+        fill_mask if fill_mask is not None
+        else np.empty((canvas_height, 0), dtype=bool),
+    )
+
     return {
         "remap_x": remap_x,
         "remap_y": remap_y,
+        "warp_roi": warp_roi,
+        "remap_x_roi": remap_x[warp_roi],
+        "remap_y_roi": remap_y[warp_roi],
         "alpha_mask": alpha_mask,
+        "alpha_fixed": alpha_fixed,
         "blend_both": blend_both,
         "blend_right_only": blend_right_only,
-        "left_placement": (y_start, y_end, x_start, x_end,
-                           src_y_start, src_y_end, src_x_start, src_x_end),
+        "left_placement": placement,
+        "left_slices": _placement_slices(placement),
         "blend_slice": (bx0, bx1),
         "fill_start": fill_start,
         "fill_mask": fill_mask,
+        "blend_kernel_args": blend_kernel_args,
         "canvas_width": canvas_width,
         "canvas_height": canvas_height,
     }
 
 
 def stitch_frame_remap(frame_left: np.ndarray, frame_right: np.ndarray,
-                       precomputed: dict) -> np.ndarray:
+                       precomputed: dict,
+                       canvas: np.ndarray = None,
+                       warped_right: np.ndarray = None) -> np.ndarray:
     """
     Stitch a single frame pair using precomputed remap arrays and static masks.
 
     Much faster than stitch_frame() because all geometry is computed once.
+    Optional canvas / warped_right scratch buffers (uint8, canvas-sized) are
+    reused instead of allocating per frame; the result is written into
+    canvas and returned. Only the warp ROI of warped_right is written; the
+    rest is never read.
     """
     canvas_h = precomputed["canvas_height"]
     canvas_w = precomputed["canvas_width"]
 
-    # 1. Remap right image (fast pixel lookup — no per-frame homography)
-    warped_right = cv2.remap(frame_right,
-                             precomputed["remap_x"], precomputed["remap_y"],
-                             cv2.INTER_LINEAR,
-                             borderMode=cv2.BORDER_CONSTANT,
-                             borderValue=(0, 0, 0))
+    # 1. Remap the right image's useful ROI (fast pixel lookup — no
+    #    per-frame homography), straight into the scratch buffer
+    if warped_right is None:
+        warped_right = np.zeros((canvas_h, canvas_w, 3), dtype=np.uint8)
+    warp_dst = warped_right[precomputed["warp_roi"]]
+    if warp_dst.size:
+        cv2.remap(frame_right,
+                  precomputed["remap_x_roi"], precomputed["remap_y_roi"],
+                  cv2.INTER_LINEAR,
+                  dst=warp_dst,
+                  borderMode=cv2.BORDER_CONSTANT,
+                  borderValue=(0, 0, 0))
 
     # 2. Place left frame on canvas
-    canvas = np.zeros((canvas_h, canvas_w, 3), dtype=np.uint8)
-    y_s, y_e, x_s, x_e, sy_s, sy_e, sx_s, sx_e = precomputed["left_placement"]
-    canvas[y_s:y_e, x_s:x_e] = frame_left[sy_s:sy_e, sx_s:sx_e]
+    if canvas is None:
+        canvas = np.zeros((canvas_h, canvas_w, 3), dtype=np.uint8)
+    else:
+        canvas.fill(0)
+    dst_slice, src_slice = precomputed["left_slices"]
+    canvas[dst_slice] = frame_left[src_slice]
+
+    # 3-4. Blend overlap region and fill right-only region past it
+    if NUMBA_AVAILABLE:
+        _blend_fill_kernel(canvas, warped_right,
+                           *precomputed["blend_kernel_args"])
+    elif AOT_KERNELS_AVAILABLE:
+        stitch_kernels.blend_fill(canvas, warped_right,
+                                  *precomputed["blend_kernel_args"])
+    else:
+        _blend_fill(canvas, warped_right, precomputed)
+
+    return canvas
 
-    # 3. Blend overlap region using precomputed static masks
+
+def _blend_fill(canvas: np.ndarray, warped_right: np.ndarray,
+                precomputed: dict):
+    """Blend the overlap and fill the right-only region in place (NumPy)."""
+    canvas_w = precomputed["canvas_width"]
+
+    # Blend overlap region using precomputed static masks
     bx0, bx1 = precomputed["blend_slice"]
     if precomputed["alpha_mask"] is not None and bx0 < bx1:
-        alpha = precomputed["alpha_mask"]
+        alpha_q = precomputed["alpha_fixed"]
         both = precomputed["blend_both"]
         r_only = precomputed["blend_right_only"]
 
-        left_region = canvas[:, bx0:bx1].astype(np.float32)
-        right_region = warped_right[:, bx0:bx1].astype(np.float32)
+        left_region = canvas[:, bx0:bx1]
+        right_region = warped_right[:, bx0:bx1]
 
-        blended = left_region.copy()
         blended = np.where(both,
-                           (1 - alpha) * left_region + alpha * right_region,
-                           blended)
+                           _blend_fixed(left_region, right_region, alpha_q),
+                           left_region)
         blended = np.where(r_only, right_region, blended)
-        canvas[:, bx0:bx1] = blended.astype(np.uint8)
+        canvas[:, bx0:bx1] = blended
 
-    # 4. Fill right-only region past blend zone
+    # Fill right-only region past blend zone
     fill_start = precomputed["fill_start"]
     fill_mask = precomputed["fill_mask"]
     if fill_mask is not None and fill_start < canvas_w:
         canvas[:, fill_start:][fill_mask] = warped_right[:, fill_start:][fill_mask]
 
-    return canvas
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _blend_fill_kernel(canvas, warped, bx0, alpha, both, r_only,
+                           fill_start, fill_mask):
+        """
+        Fused blend + right-only fill, one pass per row with no temporaries.
+
+        Bit-identical to _blend_fill(): alpha holds the same 8.8 fixed-point
+        weights and rounds the same way. Arguments come from
+        precomputed["blend_kernel_args"] (empty arrays disable a stage).
+        """
+        blend_w = alpha.shape[0]
+        fill_w = fill_mask.shape[1]
+        for y in prange(canvas.shape[0]):
+            for i in range(blend_w):
+                x = bx0 + i
+                if both[y, i]:
+                    a = np.int32(alpha[i])
+                    for c in range(3):
+                        canvas[y, x, c] = np.uint8(
+                            (np.int32(canvas[y, x, c]) * (256 - a)
+                             + np.int32(warped[y, x, c]) * a + 128) >> 8)
+                elif r_only[y, i]:
+                    for c in range(3):
+                        canvas[y, x, c] = warped[y, x, c]
+            for i in range(fill_w):
+                if fill_mask[y, i]:
+                    x = fill_start + i
+                    for c in range(3):
+                        canvas[y, x, c] = warped[y, x, c]
+
+
+def cuda_available() -> bool:
+    """Return True if OpenCV was built with CUDA and a device is present."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def compute_blend_weights(precomputed: dict) -> tuple:
+    """
+    Expand the static blend masks into full-canvas per-pixel weights.
+
+    The returned (weight_left, weight_right) float32 arrays satisfy
+    canvas = left * weight_left + right * weight_right, reproducing the
+    placement, linear blend, and right-only fill of stitch_frame_remap().
+    """
+    canvas_h = precomputed["canvas_height"]
+    canvas_w = precomputed["canvas_width"]
+    weight_left = np.zeros((canvas_h, canvas_w), dtype=np.float32)
+    weight_right = np.zeros((canvas_h, canvas_w), dtype=np.float32)
+
+    y_s, y_e, x_s, x_e = precomputed["left_placement"][:4]
+    weight_left[y_s:y_e, x_s:x_e] = 1.0
+
+    bx0, bx1 = precomputed["blend_slice"]
+    if precomputed["alpha_mask"] is not None and bx0 < bx1:
+        alpha = np.broadcast_to(precomputed["alpha_mask"][:, :, 0],
+                                (canvas_h, bx1 - bx0))
+        both = precomputed["blend_both"][:, :, 0]
+        r_only = precomputed["blend_right_only"][:, :, 0]
+        wl = weight_left[:, bx0:bx1]
+        wr = weight_right[:, bx0:bx1]
+        wl[both] = 1.0 - alpha[both]
+        wr[both] = alpha[both]
+        wr[r_only] = 1.0
+
+    fill_start = precomputed["fill_start"]
+    fill_mask = precomputed["fill_mask"]
+    if fill_mask is not None and fill_start < canvas_w:
+        weight_right[:, fill_start:][fill_mask] = 1.0
+
+    return weight_left, weight_right
+
+
+def prepare_gpu_stitch(H_adjusted: np.ndarray, precomputed: dict) -> dict:
+    """
+    Upload the static stitch state to the GPU.
+
+    Call once before the frame loop (requires cuda_available()). The returned
+    dict is passed to stitch_frame_gpu() for each frame.
+    """
+    canvas_h = precomputed["canvas_height"]
+    canvas_w = precomputed["canvas_width"]
+    y_s, y_e, x_s, x_e, sy_s, sy_e, sx_s, sx_e = precomputed["left_placement"]
+
+    weight_left, weight_right = compute_blend_weights(precomputed)
+    gpu_weight_left = cv2.cuda_GpuMat()
+    gpu_weight_left.upload(weight_left)
+    gpu_weight_right = cv2.cuda_GpuMat()
+    gpu_weight_right.upload(weight_right)
+
+    return {
+        "H_adjusted": H_adjusted,
+        "dsize": (canvas_w, canvas_h),
+        "left_src": (sy_s, sy_e, sx_s, sx_e),
+        # top, bottom, left, right padding to place the left frame on canvas
+        "left_border": (y_s, canvas_h - y_e, x_s, canvas_w - x_e),
+        "weight_left": gpu_weight_left,
+        "weight_right": gpu_weight_right,
+    }
+
+
+def stitch_frame_gpu(gpu_left, gpu_right, gpu_state: dict):
+    """
+    Stitch a single frame pair entirely on the GPU.
+
+    Args:
+        gpu_left: Left camera frame as a cv2.cuda_GpuMat (BGR).
+        gpu_right: Right camera frame as a cv2.cuda_GpuMat (BGR).
+        gpu_state: Static state from prepare_gpu_stitch().
+
+    Returns:
+        Stitched panorama as a cv2.cuda_GpuMat (BGR). Call .download() to
+        get a numpy array.
+    """
+    warped_right = cv2.cuda.warpPerspective(
+        gpu_right, gpu_state["H_adjusted"], gpu_state["dsize"],
+        flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT
+    )
+
+    sy_s, sy_e, sx_s, sx_e = gpu_state["left_src"]
+    top, bottom, left, right = gpu_state["left_border"]
+    left_src = gpu_left.rowRange(sy_s, sy_e).colRange(sx_s, sx_e)
+    canvas_left = cv2.cuda.copyMakeBorder(
+        left_src, top, bottom, left, right,
+        cv2.BORDER_CONSTANT, value=(0, 0, 0)
+    )
+
+    # Per-pixel weights encode placement, linear blend, and right-only fill
+    return cv2.cuda.blendLinear(canvas_left, warped_right,
+                                gpu_state["weight_left"],
+                                gpu_state["weight_right"])
+
+
+@dataclass
+class StitchContext:
+    """
+    Calibration-derived stitch state and scratch buffers for one video.
+
+    Built once per stitch_videos() call so the frame loop passes a single
+    reference instead of re-threading the geometry and buffers per frame.
+    Stitched frames may still be queued for (or being encoded by) the
+    writer thread, so output canvases rotate through a ring large enough
+    that none is reused until written.
+    """
+    precomputed: dict
+    canvas_ring: list
+    warped_right: np.ndarray
+    gpu_state: dict | None = None
+    gpu_frames: tuple | None = None
+    frame_index: int = 0
+
+    @classmethod
+    def create(cls, H_adjusted: np.ndarray, precomputed: dict,
+               use_gpu: bool = False,
+               ring_size: int | None = None) -> "StitchContext":
+        """
+        Allocate the buffers (and GPU state, if requested) for precomputed.
+
+        ring_size defaults to PIPELINE_DEPTH + 2, read at call time so it
+        tracks the current pipeline depth.
+        """
+        if ring_size is None:
+            ring_size = PIPELINE_DEPTH + 2
+        shape = (precomputed["canvas_height"], precomputed["canvas_width"], 3)
+        ctx = cls(
+            precomputed=precomputed,
+            canvas_ring=[np.zeros(shape, dtype=np.uint8) for _ in range(ring_size)],
+            warped_right=np.zeros(shape, dtype=np.uint8),
+        )
+        if use_gpu:
+            ctx.gpu_state = prepare_gpu_stitch(H_adjusted, precomputed)
+            ctx.gpu_frames = (cv2.cuda_GpuMat(), cv2.cuda_GpuMat())
+        return ctx
+
+    def stitch(self, frame_left: np.ndarray,
+               frame_right: np.ndarray) -> np.ndarray:
+        """Stitch one frame pair into the next canvas of the ring."""
+        canvas = self.canvas_ring[self.frame_index % len(self.canvas_ring)]
+        self.frame_index += 1
+
+        if self.gpu_state is not None:
+            gpu_left, gpu_right = self.gpu_frames
+            gpu_left.upload(frame_left)
+            gpu_right.upload(frame_right)
+            return stitch_frame_gpu(gpu_left, gpu_right,
+                                    self.gpu_state).download(canvas)
+
+        return stitch_frame_remap(frame_left, frame_right, self.precomputed,
+                                  canvas=canvas,
+                                  warped_right=self.warped_right)
+
+
+def _read_frame_pairs(cap_left: cv2.VideoCapture, cap_right: cv2.VideoCapture,
+                      read_q: queue.Queue, stop: threading.Event,
+                      errors: list):
+    """
+    Reader stage: decode frame pairs into read_q until either video ends.
+
+    Each item is (ret_left, ret_right, frame_left, frame_right); the first
+    item with a False flag is the last one queued. An exception is appended
+    to errors (and stops the pipeline) instead of killing the thread silently.
+    """
+    try:
+        # VideoCapture.read() releases the GIL while decoding, so the two
+        # independent streams decode in parallel on their own workers
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            while not stop.is_set():
+                future_left = pool.submit(cap_left.read)
+                future_right = pool.submit(cap_right.read)
+                ret_left, frame_left = future_left.result()
+                ret_right, frame_right = future_right.result()
+                item = (ret_left, ret_right, frame_left, frame_right)
+
+                # Poll so a stopped consumer can't leave this thread blocked forever
+                while not stop.is_set():
+                    try:
+                        read_q.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+                if not ret_left or not ret_right:
+                    return
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+
+
+def _write_frames(writer: cv2.VideoWriter, write_q: queue.Queue,
+                  stop: threading.Event, errors: list):
+    """
+    Writer stage: encode frames from write_q until a None sentinel.
+
+    An exception is appended to errors (and stops the pipeline) instead of
+    killing the thread silently.
+    """
+    try:
+        while True:
+            frame = write_q.get()
+            if frame is None:
+                return
+            writer.write(frame)
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+
+
+def _pipeline_get(q: queue.Queue, producer: threading.Thread, errors: list):
+    """
+    Take the next item from q, re-raising a worker's error instead of
+    waiting forever on a producer that has died.
+    """
+    while True:
+        if errors:
+            raise errors[0]
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if not producer.is_alive() and q.empty():
+                if errors:
+                    raise errors[0]
+                raise RuntimeError("Pipeline reader exited before the video ended")
+
+
+def _pipeline_put(q: queue.Queue, item, consumer: threading.Thread,
+                  errors: list):
+    """
+    Put item on q, re-raising a worker's error instead of blocking forever
+    on a full queue whose consumer has died.
+    """
+    while True:
+        if errors:
+            raise errors[0]
+        if not consumer.is_alive():
+            raise RuntimeError("Pipeline writer exited before the video ended")
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
 
 
 def stitch_videos(left_path: str, right_path: str,
@@ -380,10 +914,11 @@ def stitch_videos(left_path: str, right_path: str,
     if np.any(np.isnan(H)) or np.any(np.isinf(H)):
         raise ValueError("Homography contains NaN or Inf values")
 
-    canvas_w = cal_data["canvas_width"]
-    canvas_h = cal_data["canvas_height"]
+    canvas_w, canvas_h = output_frame_size(cal_data["canvas_width"],
+                                           cal_data["canvas_height"])
     if canvas_w <= 0 or canvas_h <= 0:
-        raise ValueError(f"Invalid canvas dimensions: {canvas_w}x{canvas_h}")
+        raise ValueError("Invalid canvas dimensions: "
+                         f"{cal_data['canvas_width']}x{cal_data['canvas_height']}")
 
     blend_start = cal_data["blend_x_start"]
     blend_end = cal_data["blend_x_end"]
@@ -391,8 +926,8 @@ def stitch_videos(left_path: str, right_path: str,
     offset_y = cal_data["offset_y"]
 
     # Step 2: Open video streams
-    cap_left = cv2.VideoCapture(left_path)
-    cap_right = cv2.VideoCapture(right_path)
+    cap_left = open_capture(left_path)
+    cap_right = open_capture(right_path)
 
     if not cap_left.isOpened() or not cap_right.isOpened():
         raise FileNotFoundError("Cannot open one or both video files")
@@ -403,9 +938,9 @@ def stitch_videos(left_path: str, right_path: str,
 
     # Apply frame offset (seek past leading frames)
     if frame_offset > 0:
-        cap_right.set(cv2.CAP_PROP_POS_FRAMES, frame_offset)
+        skip_frames(cap_right, frame_offset)
     elif frame_offset < 0:
-        cap_left.set(cv2.CAP_PROP_POS_FRAMES, -frame_offset)
+        skip_frames(cap_left, -frame_offset)
 
     total_frames = min(
         total_left - max(0, -frame_offset),
@@ -414,11 +949,7 @@ def stitch_videos(left_path: str, right_path: str,
 
     # Step 3: Set up output video
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    # Use MJPG — mp4v has a 4096px dimension limit and OpenH264 is
-    # unavailable on this system. MJPG handles large panorama dimensions
-    # reliably; the final render stage re-encodes to H.264 anyway.
-    fourcc = cv2.VideoWriter_fourcc(*"MJPG")
-    writer = cv2.VideoWriter(output_path, fourcc, fps, (canvas_w, canvas_h))
+    writer = open_writer(output_path, fps, (canvas_w, canvas_h))
 
     if not writer.isOpened():
         raise RuntimeError(f"Cannot create output video: {output_path}")
@@ -442,15 +973,38 @@ def stitch_videos(left_path: str, right_path: str,
         blend_start, blend_end
     )
 
+    ctx = StitchContext.create(H_adjusted, precomputed,
+                               use_gpu=cuda_available())
+    if ctx.gpu_state is not None:
+        print("CUDA device found, stitching on GPU")
+
     # Step 4: Process frames
     print(f"Stitching {total_frames} frames at {fps:.1f} fps...")
     print(f"Output: {canvas_w}x{canvas_h}")
 
+    # Decode, stitch, and encode run concurrently: a reader thread fills
+    # read_q, this thread stitches, and a writer thread drains write_q.
+    # Worker exceptions land in errors and are re-raised here.
+    read_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+    write_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+    stop = threading.Event()
+    errors = []
+    reader_thread = threading.Thread(
+        target=_read_frame_pairs,
+        args=(cap_left, cap_right, read_q, stop, errors),
+        daemon=True
+    )
+    writer_thread = threading.Thread(
+        target=_write_frames, args=(writer, write_q, stop, errors), daemon=True
+    )
+    reader_thread.start()
+    writer_thread.start()
+
     frame_num = 0
     try:
         while True:
-            ret_left, frame_left = cap_left.read()
-            ret_right, frame_right = cap_right.read()
+            ret_left, ret_right, frame_left, frame_right = _pipeline_get(
+                read_q, reader_thread, errors)
 
             if not ret_left or not ret_right:
                 if frame_num < total_frames:
@@ -458,9 +1012,8 @@ def stitch_videos(left_path: str, right_path: str,
                     print(f"  Warning: {which} video ended at frame {frame_num}/{total_frames}")
                 break
 
-            stitched = stitch_frame_remap(frame_left, frame_right, precomputed)
-
-            writer.write(stitched)
+            _pipeline_put(write_q, ctx.stitch(frame_left, frame_right),
+                          writer_thread, errors)
             frame_num += 1
 
             if progress_callback:
@@ -469,10 +1022,24 @@ def stitch_videos(left_path: str, right_path: str,
                 pct = frame_num / max(total_frames, 1) * 100
                 print(f"  Frame {frame_num}/{total_frames} ({pct:.1f}%)")
     finally:
+        stop.set()
+        # A dead writer never drains the queue; don't block on its sentinel
+        while writer_thread.is_alive():
+            try:
+                write_q.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        reader_thread.join()
+        writer_thread.join()
         cap_left.release()
         cap_right.release()
         writer.release()
 
+    # The writer can still fail on the last frames after the loop finished
+    if errors:
+        raise errors[0]
+
     print(f"Stitching complete: {frame_num} frames written to {output_path}")
     return output_path
 
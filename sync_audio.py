@@ -13,34 +13,51 @@ Usage:
 import argparse
 import os
 import subprocess
-import tempfile
 
 import numpy as np
 from scipy.io import wavfile
-from scipy.signal import fftconvolve
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.signal import resample_poly
 
+# Seconds of overlapping audio GCC-PHAT needs for a reliable peak
+PHAT_OVERLAP_SECONDS = 15.0
 
-def extract_audio(video_path: str, output_wav: str, sample_rate: int = 16000):
+# Coarse correlation rate: ±125 us resolution, far below one video frame
+SYNC_SAMPLE_RATE = 4000
+
+# Optional refinement re-correlates this many seconds around the coarse peak
+REFINE_WINDOW_SECONDS = 0.5
+
+
+def extract_audio_pcm(video_path: str, sample_rate: int = 16000) -> np.ndarray:
     """
-    Extract mono audio from a video file using ffmpeg.
+    Decode mono audio from a video file by streaming raw PCM from ffmpeg.
+
+    ffmpeg writes signed 16-bit samples to stdout, so no temporary WAV is
+    written to or parsed from disk.
 
     Args:
         video_path: Path to the video file.
-        output_wav: Path for the output WAV file.
         sample_rate: Target sample rate (default: 16000 Hz).
+
+    Returns:
+        Audio data as float32 numpy array, normalized to [-1, 1].
     """
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg",
         "-i", video_path,
         "-vn",              # no video
         "-ac", "1",         # mono
         "-ar", str(sample_rate),
-        "-f", "wav",
-        output_wav
+        "-f", "s16le",      # raw little-endian int16
+        "pipe:1"
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True)
     if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg audio extraction failed: {result.stderr}")
+        stderr = result.stderr.decode(errors="replace")
+        raise RuntimeError(f"ffmpeg audio extraction failed: {stderr}")
+
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
 
 
 def load_audio(path: str) -> tuple:
@@ -71,7 +88,12 @@ def load_audio(path: str) -> tuple:
 def cross_correlate_offset(audio_left: np.ndarray, audio_right: np.ndarray,
                            sample_rate: int, max_offset_seconds: float = 30.0) -> float:
     """
-    Compute the time offset between two audio signals using cross-correlation.
+    Compute the time offset between two audio signals using GCC-PHAT.
+
+    The cross-spectrum is whitened (phase transform) before the inverse FFT,
+    so every frequency contributes equally and the peak stays sharp even
+    with tonal or low-frequency-heavy audio. The peak is refined to
+    sub-sample precision by parabolic interpolation.
 
     A positive result means audio_right is ahead (started earlier) by that many seconds.
     A negative result means audio_right is behind (started later).
@@ -87,17 +109,27 @@ def cross_correlate_offset(audio_left: np.ndarray, audio_right: np.ndarray,
     """
     max_offset_samples = int(max_offset_seconds * sample_rate)
 
-    # Truncate to reasonable length for cross-correlation (use first 60 seconds)
-    max_samples = min(60 * sample_rate, len(audio_left), len(audio_right))
+    # PHAT needs far less audio than a raw correlation: use enough for
+    # PHAT_OVERLAP_SECONDS of overlap at the largest offset searched
+    window_seconds = min(PHAT_OVERLAP_SECONDS + max_offset_seconds, 60.0)
+    max_samples = min(int(window_seconds * sample_rate),
+                      len(audio_left), len(audio_right))
     a = audio_left[:max_samples]
     b = audio_right[:max_samples]
 
-    # Normalize
-    a = (a - a.mean()) / (a.std() + 1e-10)
-    b = (b - b.mean()) / (b.std() + 1e-10)
+    # Normalize (single precision keeps the FFTs in float32/complex64)
+    a = ((a - a.mean()) / (a.std() + 1e-10)).astype(np.float32)
+    b = ((b - b.mean()) / (b.std() + 1e-10)).astype(np.float32)
 
-    # Cross-correlate using FFT
-    correlation = fftconvolve(a, b[::-1], mode="full")
+    # GCC-PHAT with a single-precision real FFT at a fast length.
+    # The circular result holds lags 0..len(a)-1 then negative lags; rotate
+    # so index i is lag i - (len(b) - 1), matching a 'full' correlation.
+    n = len(a) + len(b) - 1
+    nfft = next_fast_len(n, real=True)
+    spectrum = rfft(a, nfft) * np.conj(rfft(b, nfft))
+    spectrum /= np.abs(spectrum) + 1e-10
+    circular = irfft(spectrum, nfft)
+    correlation = np.concatenate((circular[nfft - (len(b) - 1):], circular[:len(a)]))
 
     # The center of the correlation output corresponds to zero lag
     center = len(a) - 1
@@ -109,74 +141,117 @@ def cross_correlate_offset(audio_left: np.ndarray, audio_right: np.ndarray,
     search_region = correlation[search_start:search_end]
     peak_index = np.argmax(search_region) + search_start
 
+    # Parabolic interpolation around the peak for sub-sample precision
+    delta = 0.0
+    if 0 < peak_index < len(correlation) - 1:
+        y_prev, y_peak, y_next = correlation[peak_index - 1:peak_index + 2]
+        denom = y_prev - 2 * y_peak + y_next
+        if denom != 0:
+            delta = float(0.5 * (y_prev - y_next) / denom)
+
     # Convert to offset in samples (positive means right leads)
-    offset_samples = peak_index - center
+    offset_samples = peak_index - center + delta
     offset_seconds = offset_samples / sample_rate
 
     return offset_seconds
 
 
+def refine_offset(audio_left: np.ndarray, audio_right: np.ndarray,
+                  sample_rate: int, coarse_offset: float,
+                  window_seconds: float = REFINE_WINDOW_SECONDS) -> float:
+    """
+    Refine a coarse offset by re-correlating within a narrow window.
+
+    The signals are aligned on the coarse offset first, so only a
+    +/- window_seconds residual has to be searched at the higher rate.
+
+    Args:
+        audio_left: Left channel audio (float32).
+        audio_right: Right channel audio (float32).
+        sample_rate: Sample rate of both signals.
+        coarse_offset: Offset in seconds from a lower-rate correlation.
+        window_seconds: Residual search range in seconds.
+
+    Returns:
+        Refined offset in seconds (same sign convention as cross_correlate_offset).
+    """
+    shift = int(round(coarse_offset * sample_rate))
+    if shift >= 0:
+        audio_left = audio_left[shift:]
+    else:
+        audio_right = audio_right[-shift:]
+
+    residual = cross_correlate_offset(audio_left, audio_right, sample_rate,
+                                      window_seconds)
+    return shift / sample_rate + residual
+
+
+def _load_source(path: str, label: str, sample_rate: int) -> np.ndarray:
+    """Load a WAV file, or stream the audio track of a video, at sample_rate."""
+    if os.path.splitext(path)[1].lower() == ".wav":
+        print(f"Loading audio from {label}: {path}")
+        sr, data = load_audio(path)
+        if sr != sample_rate:
+            divisor = np.gcd(sr, sample_rate)
+            data = resample_poly(data, sample_rate // divisor, sr // divisor)
+            data = data.astype(np.float32)
+        return data
+
+    print(f"Extracting audio from {label}: {path}")
+    return extract_audio_pcm(path, sample_rate)
+
+
 def sync_audio(left_path: str, right_path: str,
-               sample_rate: int = 16000,
-               max_offset: float = 30.0) -> float:
+               sample_rate: int = SYNC_SAMPLE_RATE,
+               max_offset: float = 30.0,
+               refine_sample_rate: int = None) -> float:
     """
     Compute the audio sync offset between two video or audio files.
 
+    Both inputs are decimated to sample_rate before correlating; 4 kHz keeps
+    the FFTs small while resolving the offset well inside one video frame.
+
     Args:
         left_path: Path to left video/audio file.
         right_path: Path to right video/audio file.
-        sample_rate: Sample rate for audio extraction.
+        sample_rate: Sample rate for the coarse correlation.
         max_offset: Maximum offset to search in seconds.
+        refine_sample_rate: If set, re-correlate a narrow window around the
+            coarse peak at this (higher) rate for sub-sample precision.
 
     Returns:
         Offset in seconds.
     """
-    ext_left = os.path.splitext(left_path)[1].lower()
-    ext_right = os.path.splitext(right_path)[1].lower()
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Extract or load audio
-        if ext_left == ".wav":
-            wav_left = left_path
-        else:
-            wav_left = os.path.join(tmpdir, "left.wav")
-            print(f"Extracting audio from left: {left_path}")
-            extract_audio(left_path, wav_left, sample_rate)
-
-        if ext_right == ".wav":
-            wav_right = right_path
-        else:
-            wav_right = os.path.join(tmpdir, "right.wav")
-            print(f"Extracting audio from right: {right_path}")
-            extract_audio(right_path, wav_right, sample_rate)
-
-        print("Loading audio...")
-        sr_left, audio_left = load_audio(wav_left)
-        sr_right, audio_right = load_audio(wav_right)
-
-        # Resample if needed (simple case: just use what we extracted at target rate)
-        if sr_left != sr_right:
-            raise RuntimeError(
-                f"Sample rate mismatch: left={sr_left}, right={sr_right}. "
-                "Extract both at the same rate."
-            )
-
-        print(f"Cross-correlating ({len(audio_left)/sr_left:.1f}s vs {len(audio_right)/sr_right:.1f}s)...")
-        offset = cross_correlate_offset(audio_left, audio_right, sr_left, max_offset)
-
-        print(f"Detected offset: {offset:+.4f} seconds ({offset * sr_left:+.0f} samples)")
-        return offset
+    audio_left = _load_source(left_path, "left", sample_rate)
+    audio_right = _load_source(right_path, "right", sample_rate)
+
+    print(f"Cross-correlating at {sample_rate} Hz "
+          f"({len(audio_left)/sample_rate:.1f}s vs {len(audio_right)/sample_rate:.1f}s)...")
+    offset = cross_correlate_offset(audio_left, audio_right, sample_rate, max_offset)
+
+    if refine_sample_rate and refine_sample_rate > sample_rate:
+        audio_left = _load_source(left_path, "left", refine_sample_rate)
+        audio_right = _load_source(right_path, "right", refine_sample_rate)
+        print(f"Refining around {offset:+.4f}s at {refine_sample_rate} Hz...")
+        offset = refine_offset(audio_left, audio_right, refine_sample_rate, offset)
+
+    print(f"Detected offset: {offset:+.4f} seconds")
+    return offset
 
 
 def main():
     parser = argparse.ArgumentParser(description="Audio cross-correlation sync")
     parser.add_argument("--left", required=True, help="Left camera video or WAV")
     parser.add_argument("--right", required=True, help="Right camera video or WAV")
-    parser.add_argument("--sample-rate", type=int, default=16000, help="Sample rate (Hz)")
+    parser.add_argument("--sample-rate", type=int, default=SYNC_SAMPLE_RATE,
+                        help="Coarse correlation sample rate (Hz)")
     parser.add_argument("--max-offset", type=float, default=30.0, help="Max offset (seconds)")
+    parser.add_argument("--refine-rate", type=int, default=None,
+                        help="Refine the offset at this sample rate (e.g. 16000)")
     args = parser.parse_args()
 
-    offset = sync_audio(args.left, args.right, args.sample_rate, args.max_offset)
+    offset = sync_audio(args.left, args.right, args.sample_rate, args.max_offset,
+                        args.refine_rate)
     print(f"\nResult: {offset:+.4f} seconds")
 
 
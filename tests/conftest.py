@@ -0,0 +1,66 @@
+"""
+Shared pytest fixtures.
+"""
+
+import functools
+import os
+
+# Keep OpenCV's FFmpeg backend and internal logger off stderr; the suite
+# writes many short clips and the codec chatter is noise under -n auto
+os.environ.setdefault("OPENCV_FFMPEG_LOGLEVEL", "-8")
+
+import cv2
+import numpy as np
+import pytest
+
+from helpers import VIDEO_FRAMES, VIDEO_HEIGHT, VIDEO_WIDTH
+
+cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_SILENT)
+
+
+def make_test_video(tmp_path, width=VIDEO_WIDTH, height=VIDEO_HEIGHT,
+                    num_frames=VIDEO_FRAMES, fps=30.0):
+    """Create a synthetic test video."""
+    path = str(tmp_path / "test_pano.mp4")
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
+
+    for i in range(num_frames):
+        frame = np.full((height, width, 3), 80, dtype=np.uint8)
+        # Add a moving circle to have some visual reference
+        cx = int(width * (i / num_frames))
+        cv2.circle(frame, (cx, height // 2), 30, (0, 255, 0), -1)
+        writer.write(frame)
+
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope="session")
+def video_factory(tmp_path_factory):
+    """
+    Encode each synthetic test video (or other media file) once per session.
+
+    video_factory(make_video, **kwargs) calls make_video(directory, **kwargs)
+    the first time that combination is requested and returns the cached path
+    afterwards. The file is shared: tests must only read it (copy it into
+    tmp_path first if it needs to change).
+    """
+    cache = {}
+
+    def make(make_video, **kwargs):
+        key = (make_video, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = make_video(tmp_path_factory.mktemp("video"), **kwargs)
+        return cache[key]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def make_video(video_factory):
+    """
+    Cached make_test_video: make_video(**kwargs) returns the path to a shared
+    read-only video.
+    """
+    return functools.partial(video_factory, make_test_video)
@@ -0,0 +1,113 @@
+"""
+Shared test constants and helpers (plain module; fixtures live in conftest.py).
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render import _get_ffmpeg_path, _get_ffprobe_path
+
+
+# Synthetic media is kept small; SOCCER_TEST_FULL_RES=1 restores realistic
+# sizes (e.g. for nightly runs)
+FULL_RES = os.environ.get("SOCCER_TEST_FULL_RES") == "1"
+VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FRAMES = (800, 400, 30) if FULL_RES else (320, 200, 5)
+IMAGE_WIDTH, IMAGE_HEIGHT, IMAGE_OVERLAP = (800, 600, 250) if FULL_RES else (400, 300, 125)
+
+
+class FakeCapture:
+    """
+    In-memory stand-in for cv2.VideoCapture serving blank frames.
+
+    For headless tests that only check viewer state and logs: nothing is
+    encoded or decoded. Pass it as InteractiveViewer(..., capture=...).
+    """
+
+    def __init__(self, num_frames, width=VIDEO_WIDTH, height=VIDEO_HEIGHT,
+                 fps=30.0):
+        self.num_frames = num_frames
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.frame.setflags(write=False)
+        self.props = {
+            cv2.CAP_PROP_FRAME_WIDTH: width,
+            cv2.CAP_PROP_FRAME_HEIGHT: height,
+            cv2.CAP_PROP_FPS: fps,
+            cv2.CAP_PROP_FRAME_COUNT: num_frames,
+        }
+        self.index = 0
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return float(self.props.get(prop, 0))
+
+    def grab(self):
+        if self.index >= self.num_frames:
+            return False
+        self.index += 1
+        return True
+
+    def retrieve(self):
+        return True, self.frame
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+
+def count_frames(path):
+    """Count video packets with ffprobe, falling back to OpenCV metadata."""
+    try:
+        # -count_packets demuxes packets without decoding them
+        result = subprocess.run(
+            [_get_ffprobe_path(), "-v", "error", "-select_streams", "v:0",
+             "-count_packets", "-show_entries", "stream=nb_read_packets",
+             "-of", "csv=p=0", path],
+            capture_output=True, text=True, timeout=10, check=True
+        )
+        return int(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired,
+            ValueError):
+        cap = cv2.VideoCapture(path)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        return frame_count
+
+
+def get_audio_streams(video_path):
+    """List audio streams with ffprobe, falling back to parsing ffmpeg -i."""
+    try:
+        result = subprocess.run(
+            [_get_ffprobe_path(), "-v", "error", "-select_streams", "a",
+             "-show_entries", "stream=index", "-of", "json", video_path],
+            capture_output=True, text=True, timeout=5, check=True
+        )
+        return json.loads(result.stdout).get("streams", [])
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired,
+            json.JSONDecodeError):
+        pass
+
+    # ffprobe may not be available (imageio-ffmpeg ships ffmpeg only).
+    # ffmpeg -i exits non-zero without an output file but still prints the
+    # stream list, e.g. "Stream #0:1: Audio: aac..."
+    try:
+        result = subprocess.run(
+            [_get_ffmpeg_path(), "-i", video_path, "-hide_banner"],
+            capture_output=True, text=True, timeout=10
+        )
+        return re.findall(r"Stream #\d+:\d+.*Audio:", result.stderr or "")
+    except subprocess.TimeoutExpired:
+        return []
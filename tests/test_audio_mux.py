@@ -8,7 +8,6 @@ Verifies:
 """
 
 import csv
-import json
 import os
 import subprocess
 import sys
@@ -21,6 +20,9 @@ from scipy.io import wavfile
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from render import render_broadcast, mux_audio
+from stitch import get_video_info
+
+from helpers import get_audio_streams
 
 
 def make_test_video(tmp_path, width=640, height=360, num_frames=30, fps=30.0):
@@ -28,9 +30,9 @@ def make_test_video(tmp_path, width=640, height=360, num_frames=30, fps=30.0):
     path = str(tmp_path / "video.mp4")
     fourcc = cv2.VideoWriter_fourcc(*"mp4v")
     writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
-    rng = np.random.RandomState(42)
+    rng = np.random.default_rng(42)
     for i in range(num_frames):
-        frame = rng.randint(50, 200, (height, width, 3), dtype=np.uint8)
+        frame = rng.integers(50, 200, (height, width, 3), dtype=np.uint8)
         writer.write(frame)
     writer.release()
     return path
@@ -56,24 +58,6 @@ def _get_ffmpeg():
     return "ffmpeg"
 
 
-def get_audio_streams(video_path):
-    """Detect audio streams using ffmpeg -i (since ffprobe may not be available)."""
-    import re
-    try:
-        ffmpeg = _get_ffmpeg()
-        result = subprocess.run(
-            [ffmpeg, "-i", video_path, "-hide_banner"],
-            capture_output=True, text=True, timeout=10
-        )
-        # ffmpeg -i returns exit code 1 when no output specified, but still prints info
-        stderr = result.stderr or ""
-        # Look for lines like "Stream #0:1: Audio: aac..."
-        audio_streams = re.findall(r"Stream #\d+:\d+.*Audio:", stderr)
-        return audio_streams
-    except subprocess.TimeoutExpired:
-        return []
-
-
 def get_duration(video_path):
     """Get video duration in seconds using ffmpeg -i."""
     import re
@@ -95,10 +79,10 @@ def get_duration(video_path):
 
 
 class TestAudioMux:
-    def test_mux_adds_audio_track(self, tmp_path):
+    def test_mux_adds_audio_track(self, tmp_path, video_factory):
         """Verify muxed file has an audio stream."""
         video_path = make_test_video(tmp_path, num_frames=30)
-        audio_path = make_test_audio(tmp_path, duration=1.0)
+        audio_path = video_factory(make_test_audio, duration=1.0)
         output_path = str(tmp_path / "muxed.mp4")
 
         # First verify no audio in source
@@ -111,31 +95,27 @@ class TestAudioMux:
         streams_after = get_audio_streams(result)
         assert len(streams_after) >= 1, "Muxed file should have audio stream"
 
-    def test_mux_preserves_video(self, tmp_path):
+    def test_mux_preserves_video(self, tmp_path, video_factory):
         """Verify video content is preserved after mux."""
         video_path = make_test_video(tmp_path, num_frames=10)
-        audio_path = make_test_audio(tmp_path, duration=0.5)
+        audio_path = video_factory(make_test_audio, duration=0.5)
         output_path = str(tmp_path / "muxed.mp4")
 
         mux_audio(video_path, audio_path, output_path)
 
-        cap = cv2.VideoCapture(output_path)
-        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
-
-        assert w == 640
-        assert h == 360
+        info = get_video_info(output_path)
+        assert info["width"] == 640
+        assert info["height"] == 360
 
-    def test_full_render_with_audio(self, tmp_path):
+    def test_full_render_with_audio(self, tmp_path, video_factory):
         """End-to-end: render + mux audio."""
         # Create panorama source
         pano_path = str(tmp_path / "panorama.mp4")
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
         writer = cv2.VideoWriter(pano_path, fourcc, 30.0, (2000, 1200))
-        rng = np.random.RandomState(42)
+        rng = np.random.default_rng(42)
         for i in range(10):
-            frame = rng.randint(30, 180, (1200, 2000, 3), dtype=np.uint8)
+            frame = rng.integers(30, 180, (1200, 2000, 3), dtype=np.uint8)
             writer.write(frame)
         writer.release()
 
@@ -158,7 +138,7 @@ class TestAudioMux:
                 })
 
         # Create audio
-        audio_path = make_test_audio(tmp_path, duration=0.5)
+        audio_path = video_factory(make_test_audio, duration=0.5)
 
         # Render
         video_only = str(tmp_path / "broadcast.mp4")
@@ -167,12 +147,10 @@ class TestAudioMux:
             output_width=640, output_height=360
         )
 
-        # Mux audio
-        final_path = str(tmp_path / "final.mp4")
-        import shutil
-        shutil.copy(video_only, final_path)
-        mux_audio(final_path, audio_path, final_path)
+        # Mux audio in place, as the render page does
+        final_path = mux_audio(video_only, audio_path, video_only)
 
+        assert final_path == video_only
         assert os.path.exists(final_path)
         streams = get_audio_streams(final_path)
         assert len(streams) >= 1
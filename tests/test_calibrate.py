@@ -7,6 +7,7 @@ Creates synthetic left/right images with known overlap and verifies:
 3. JSON calibration file is written with correct structure
 """
 
+import functools
 import json
 import os
 import sys
@@ -27,32 +28,30 @@ from calibrate import (
     calibrate,
 )
 
+from helpers import IMAGE_HEIGHT, IMAGE_OVERLAP, IMAGE_WIDTH
 
-def make_test_images(width=800, height=600, overlap_px=250):
+
+@functools.lru_cache(maxsize=None)
+def make_test_images(width=IMAGE_WIDTH, height=IMAGE_HEIGHT,
+                     overlap_px=IMAGE_OVERLAP):
     """
     Create two synthetic images with a known overlapping region containing
-    recognizable features (random textured pattern with shapes).
+    recognizable features (dilated random noise texture).
+
+    Deterministic, so results are cached per argument set and returned
+    read-only.
     """
     # Create a wide source image with rich texture for feature detection
     full_width = 2 * width - overlap_px
-    rng = np.random.RandomState(42)
+    rng = np.random.default_rng(42)
 
     # Base: random noise texture (features need texture to detect)
-    full_img = rng.randint(0, 256, (height, full_width, 3), dtype=np.uint8)
-
-    # Add some geometric shapes for robust features
-    for _ in range(50):
-        cx = rng.randint(0, full_width)
-        cy = rng.randint(0, height)
-        r = rng.randint(10, 50)
-        color = tuple(int(c) for c in rng.randint(0, 256, 3))
-        cv2.circle(full_img, (cx, cy), r, color, -1)
-
-    for _ in range(30):
-        x1, y1 = rng.randint(0, full_width), rng.randint(0, height)
-        x2, y2 = x1 + rng.randint(20, 100), y1 + rng.randint(20, 100)
-        color = tuple(int(c) for c in rng.randint(0, 256, 3))
-        cv2.rectangle(full_img, (x1, y1), (x2, y2), color, -1)
+    full_img = rng.integers(0, 256, (height, full_width, 3), dtype=np.uint8)
+
+    # 3x3 max-pool gives the noise some low-frequency structure for robust
+    # features without drawing shapes one call at a time (larger kernels
+    # saturate towards white and SIFT finds nothing)
+    full_img = cv2.dilate(full_img, np.ones((3, 3), np.uint8))
 
     # Apply Gaussian blur to make features more stable
     full_img = cv2.GaussianBlur(full_img, (5, 5), 1.0)
@@ -60,14 +59,35 @@ def make_test_images(width=800, height=600, overlap_px=250):
     # Split into left and right with overlap
     img_left = full_img[:, :width].copy()
     img_right = full_img[:, (width - overlap_px):].copy()
+    img_left.setflags(write=False)
+    img_right.setflags(write=False)
 
     return img_left, img_right
 
 
+# The tests below only read these, so build them once per session
+@pytest.fixture(scope="session")
+def synthetic_pair():
+    return make_test_images()
+
+
+@pytest.fixture(scope="session")
+def matched_pts(synthetic_pair):
+    img_left, img_right = synthetic_pair
+    return detect_and_match(img_left, img_right, overlap_fraction=0.4,
+                            min_matches=5)
+
+
+@pytest.fixture(scope="session")
+def homography(matched_pts):
+    return compute_homography(*matched_pts)
+
+
 class TestExtractFrame:
     def test_extract_from_image_file(self, tmp_path):
         img = np.zeros((100, 200, 3), dtype=np.uint8)
-        img_path = str(tmp_path / "test.jpg")
+        # Uncompressed BMP exercises the same image branch without a codec
+        img_path = str(tmp_path / "test.bmp")
         cv2.imwrite(img_path, img)
 
         result = extract_frame(img_path)
@@ -80,11 +100,8 @@ class TestExtractFrame:
 
 
 class TestDetectAndMatch:
-    def test_finds_matches_in_overlapping_images(self):
-        img_left, img_right = make_test_images()
-        pts_left, pts_right = detect_and_match(
-            img_left, img_right, overlap_fraction=0.4, min_matches=5
-        )
+    def test_finds_matches_in_overlapping_images(self, matched_pts):
+        pts_left, pts_right = matched_pts
         assert len(pts_left) >= 5
         assert len(pts_right) >= 5
         assert pts_left.shape[1] == 2
@@ -102,38 +119,28 @@ class TestDetectAndMatch:
 
 
 class TestComputeHomography:
-    def test_homography_is_3x3(self):
-        img_left, img_right = make_test_images()
-        pts_left, pts_right = detect_and_match(
-            img_left, img_right, overlap_fraction=0.4, min_matches=5
-        )
-        H, mask = compute_homography(pts_left, pts_right)
+    def test_homography_is_3x3(self, homography):
+        H, mask = homography
         assert H.shape == (3, 3)
         assert mask is not None
 
-    def test_homography_is_approximately_translation(self):
+    def test_homography_is_approximately_translation(self, homography):
         """With synthetic images, the homography should be close to a pure translation."""
-        img_left, img_right = make_test_images(overlap_px=250)
-        pts_left, pts_right = detect_and_match(
-            img_left, img_right, overlap_fraction=0.4, min_matches=5
-        )
-        H, _ = compute_homography(pts_left, pts_right)
+        H, _ = homography
 
         # For images that are just offset, H should be close to:
         # [[1, 0, tx], [0, 1, ty], [0, 0, 1]]
-        # The translation should be roughly (width - overlap) = 550 in x
+        # The translation should be roughly (width - overlap) in x
+        min_tx = 0.7 * (IMAGE_WIDTH - IMAGE_OVERLAP)
         assert abs(H[0, 0] - 1.0) < 0.15, f"H[0,0] = {H[0,0]}, expected ~1.0"
         assert abs(H[1, 1] - 1.0) < 0.15, f"H[1,1] = {H[1,1]}, expected ~1.0"
-        assert H[0, 2] > 400, f"Translation x = {H[0,2]}, expected > 400"
+        assert H[0, 2] > min_tx, f"Translation x = {H[0,2]}, expected > {min_tx}"
 
 
 class TestCanvasAndBlend:
-    def test_canvas_larger_than_either_image(self):
-        img_left, img_right = make_test_images()
-        pts_left, pts_right = detect_and_match(
-            img_left, img_right, overlap_fraction=0.4, min_matches=5
-        )
-        H, _ = compute_homography(pts_left, pts_right)
+    def test_canvas_larger_than_either_image(self, synthetic_pair, homography):
+        img_left, img_right = synthetic_pair
+        H, _ = homography
         canvas_w, canvas_h, blend_start, blend_end, _, _ = \
             compute_canvas_and_blend(img_left, img_right, H)
 
@@ -170,9 +177,9 @@ class TestSaveCalibration:
 
 
 class TestFullCalibration:
-    def test_end_to_end_with_images(self, tmp_path):
+    def test_end_to_end_with_images(self, tmp_path, synthetic_pair):
         """Full pipeline: save test images, run calibrate(), verify output."""
-        img_left, img_right = make_test_images()
+        img_left, img_right = synthetic_pair
 
         left_path = str(tmp_path / "left.jpg")
         right_path = str(tmp_path / "right.jpg")
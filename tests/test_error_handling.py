@@ -12,10 +12,9 @@ Verifies:
 import csv
 import json
 import os
+import shutil
 import sys
 
-import cv2
-import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,17 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from render import render_broadcast, read_log
 from stitch import stitch_videos
 
-
-def make_test_video(tmp_path, width=640, height=360, num_frames=10, fps=30.0):
-    """Create a test video."""
-    path = str(tmp_path / "video.mp4")
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
-    rng = np.random.RandomState(42)
-    for _ in range(num_frames):
-        writer.write(rng.randint(30, 200, (height, width, 3), dtype=np.uint8))
-    writer.release()
-    return path
+from helpers import count_frames
 
 
 class TestMissingFiles:
@@ -49,9 +38,9 @@ class TestMissingFiles:
             render_broadcast("/nonexistent/video.mp4", log_path,
                              str(tmp_path / "out.mp4"), output_width=320, output_height=180)
 
-    def test_render_missing_log(self, tmp_path):
+    def test_render_missing_log(self, tmp_path, make_video):
         """Render with missing log raises FileNotFoundError."""
-        video_path = make_test_video(tmp_path)
+        video_path = make_video()
         with pytest.raises(FileNotFoundError):
             render_broadcast(video_path, "/nonexistent/log.csv",
                              str(tmp_path / "out.mp4"))
@@ -80,25 +69,32 @@ class TestMissingFiles:
             read_log(path)
 
 
+@pytest.fixture(scope="module")
+def left_right_pair(tmp_path_factory, make_video):
+    """One cached video copied to distinct left/right paths."""
+    d = tmp_path_factory.mktemp("lr")
+    src = make_video()
+    left_path = str(d / "left.mp4")
+    right_path = str(d / "right.mp4")
+    shutil.copy(src, left_path)
+    shutil.copy(src, right_path)
+    return left_path, right_path
+
+
 class TestInvalidCalibration:
-    def test_missing_keys(self, tmp_path):
+    def test_missing_keys(self, tmp_path, left_right_pair):
         """Stitch with calibration missing keys raises ValueError."""
         cal_path = str(tmp_path / "bad_cal.json")
         with open(cal_path, "w") as f:
             json.dump({"homography": [[1, 0, 0], [0, 1, 0], [0, 0, 1]]}, f)
 
-        left_path = make_test_video(tmp_path)
-        right_path = make_test_video(tmp_path)
-        # Rename to avoid collision
-        import shutil
-        right_path2 = str(tmp_path / "right.mp4")
-        shutil.copy(left_path, right_path2)
+        left_path, right_path = left_right_pair
 
         with pytest.raises(ValueError, match="missing required keys"):
-            stitch_videos(left_path, right_path2,
+            stitch_videos(left_path, right_path,
                           str(tmp_path / "out.mp4"), cal_path=cal_path)
 
-    def test_nan_homography(self, tmp_path):
+    def test_nan_homography(self, tmp_path, left_right_pair):
         """Stitch with NaN homography raises ValueError."""
         cal_path = str(tmp_path / "nan_cal.json")
         cal_data = {
@@ -110,16 +106,13 @@ class TestInvalidCalibration:
         with open(cal_path, "w") as f:
             json.dump(cal_data, f)
 
-        left_path = make_test_video(tmp_path)
-        import shutil
-        right_path = str(tmp_path / "right.mp4")
-        shutil.copy(left_path, right_path)
+        left_path, right_path = left_right_pair
 
         with pytest.raises(ValueError, match="NaN"):
             stitch_videos(left_path, right_path,
                           str(tmp_path / "out.mp4"), cal_path=cal_path)
 
-    def test_invalid_canvas_dimensions(self, tmp_path):
+    def test_invalid_canvas_dimensions(self, tmp_path, left_right_pair):
         """Stitch with zero canvas dimensions raises ValueError."""
         cal_path = str(tmp_path / "zero_cal.json")
         cal_data = {
@@ -131,10 +124,7 @@ class TestInvalidCalibration:
         with open(cal_path, "w") as f:
             json.dump(cal_data, f)
 
-        left_path = make_test_video(tmp_path)
-        import shutil
-        right_path = str(tmp_path / "right.mp4")
-        shutil.copy(left_path, right_path)
+        left_path, right_path = left_right_pair
 
         with pytest.raises(ValueError, match="Invalid canvas"):
             stitch_videos(left_path, right_path,
@@ -142,31 +132,23 @@ class TestInvalidCalibration:
 
 
 class TestMalformedCSV:
-    def test_bad_crop_values_dont_crash(self, tmp_path):
+    def test_bad_crop_values_dont_crash(self, tmp_path, make_video):
         """Render continues on bad crop values, skipping bad frames."""
-        video_path = make_test_video(tmp_path, num_frames=5)
+        video_path = make_video(num_frames=5)
         log_path = str(tmp_path / "log.csv")
         fieldnames = ["frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
                        "home_score", "away_score", "clock_running", "clock_seconds",
                        "half", "scoreboard_visible"]
+        # Columns after crop_h are the same on every row
+        tail = (0, 0, "false", 0, 1, "true")
         with open(log_path, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            # Good row
-            w.writerow({"frame": 0, "timestamp": "0.000",
-                        "crop_x": 0, "crop_y": 0, "crop_w": 320, "crop_h": 180,
-                        "home_score": 0, "away_score": 0, "clock_running": "false",
-                        "clock_seconds": 0, "half": 1, "scoreboard_visible": "true"})
-            # Bad row with non-numeric crop
-            w.writerow({"frame": 1, "timestamp": "0.033",
-                        "crop_x": "abc", "crop_y": 0, "crop_w": 320, "crop_h": 180,
-                        "home_score": 0, "away_score": 0, "clock_running": "false",
-                        "clock_seconds": 0, "half": 1, "scoreboard_visible": "true"})
-            # Good row
-            w.writerow({"frame": 2, "timestamp": "0.066",
-                        "crop_x": 0, "crop_y": 0, "crop_w": 320, "crop_h": 180,
-                        "home_score": 0, "away_score": 0, "clock_running": "false",
-                        "clock_seconds": 0, "half": 1, "scoreboard_visible": "true"})
+            w = csv.writer(f)
+            w.writerow(fieldnames)
+            w.writerows([
+                (0, "0.000", 0, 0, 320, 180) + tail,      # Good row
+                (1, "0.033", "abc", 0, 320, 180) + tail,  # Bad row with non-numeric crop
+                (2, "0.066", 0, 0, 320, 180) + tail,      # Good row
+            ])
 
         output_path = str(tmp_path / "out.mp4")
         # Should not crash — skips the bad frame
@@ -176,21 +158,20 @@ class TestMalformedCSV:
 
 
 class TestEndOfVideo:
-    def test_video_shorter_than_log(self, tmp_path):
+    def test_video_shorter_than_log(self, tmp_path, make_video):
         """Render handles video ending before log rows exhausted."""
-        video_path = make_test_video(tmp_path, num_frames=3)
+        video_path = make_video(num_frames=3)
         log_path = str(tmp_path / "log.csv")
         fieldnames = ["frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
                        "home_score", "away_score", "clock_running", "clock_seconds",
                        "half", "scoreboard_visible"]
+        crop = (0, 0, 320, 180)
+        tail = (0, 0, "false", 0, 1, "true")
         with open(log_path, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
+            w = csv.writer(f)
+            w.writerow(fieldnames)
             for i in range(10):  # More rows than video frames
-                w.writerow({"frame": i, "timestamp": f"{i/30:.3f}",
-                            "crop_x": 0, "crop_y": 0, "crop_w": 320, "crop_h": 180,
-                            "home_score": 0, "away_score": 0, "clock_running": "false",
-                            "clock_seconds": 0, "half": 1, "scoreboard_visible": "true"})
+                w.writerow((i, f"{i/30:.3f}") + crop + tail)
 
         output_path = str(tmp_path / "out.mp4")
         render_broadcast(video_path, log_path, output_path,
@@ -198,10 +179,7 @@ class TestEndOfVideo:
         assert os.path.exists(output_path)
 
         # Output should have 3 frames (video length), not 10
-        cap = cv2.VideoCapture(output_path)
-        fc = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        cap.release()
-        assert fc == 3
+        assert count_frames(output_path) == 3
 
 
 class TestJoystickDisconnect:
@@ -210,10 +188,10 @@ class TestJoystickDisconnect:
         from interactive import InteractiveViewer
         assert hasattr(InteractiveViewer, "_try_reconnect_joystick")
 
-    def test_handle_joystick_with_no_joystick(self, tmp_path):
+    def test_handle_joystick_with_no_joystick(self, make_video):
         """Verify handle_joystick is safe with no joystick."""
         from interactive import InteractiveViewer
-        video_path = make_test_video(tmp_path)
+        video_path = make_video()
         viewer = InteractiveViewer(video_path)
         viewer.joystick = None
         # Should not raise
@@ -9,188 +9,153 @@ Tests run in headless mode (no display window). Verifies:
 5. Log is recorded correctly
 """
 
+import csv
 import os
 import sys
 
-import cv2
-import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from interactive import CropState, InteractiveViewer
 
+from helpers import VIDEO_FRAMES, VIDEO_HEIGHT, VIDEO_WIDTH
 
-def make_test_video(tmp_path, width=800, height=400, num_frames=30, fps=30.0):
-    """Create a synthetic test video."""
-    path = str(tmp_path / "test_pano.mp4")
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
 
-    rng = np.random.RandomState(42)
-    for i in range(num_frames):
-        frame = rng.randint(50, 200, (height, width, 3), dtype=np.uint8)
-        # Add a moving circle to have some visual reference
-        cx = int(width * (i / num_frames))
-        cv2.circle(frame, (cx, height // 2), 30, (0, 255, 0), -1)
-        writer.write(frame)
+@pytest.fixture
+def crop():
+    return CropState(8000, 3000)
 
-    writer.release()
-    return path
+
+@pytest.fixture(scope="module")
+def played_viewer(make_video):
+    """
+    Viewer after one full headless run of a 10-frame clip, shared by the
+    tests that only inspect the result (treat it as read-only).
+    """
+    viewer = InteractiveViewer(make_video(num_frames=10))
+    viewer.run(headless=True)
+    return viewer
 
 
 class TestCropState:
-    def test_initial_position_is_centered(self):
-        crop = CropState(8000, 3000)
+    def test_initial_position_is_centered(self, crop):
         assert crop.center_x == 4000
         assert crop.center_y == 1500
 
-    def test_crop_dimensions_at_1x_zoom(self):
-        crop = CropState(8000, 3000)
-        crop.zoom = 1.0
-        assert crop.crop_w == 1920
-        assert crop.crop_h == 1080
-
-    def test_crop_dimensions_at_max_zoom(self):
-        crop = CropState(8000, 3000)
-        crop.zoom = 1.2
-        assert crop.crop_w == 1600
-        assert crop.crop_h == 900
-
-    def test_crop_dimensions_at_full_pano(self):
-        crop = CropState(8000, 3000)
-        crop.zoom = 0
-        assert crop.crop_w == 8000
-        assert crop.crop_h == 3000
-
-    def test_move_right(self):
-        crop = CropState(8000, 3000)
+    @pytest.mark.parametrize("zoom,w,h", [
+        (1.0, 1920, 1080),
+        (1.2, 1600, 900),
+        (0, 8000, 3000),  # Full pano
+    ], ids=["1x", "max", "full_pano"])
+    def test_crop_dimensions(self, crop, zoom, w, h):
+        crop.zoom = zoom
+        assert crop.crop_w == w
+        assert crop.crop_h == h
+
+    def test_move_right(self, crop):
         original_x = crop.center_x
         crop.move(100, 0)
         assert crop.center_x == original_x + 100
         assert crop.center_y == 1500  # Y unchanged
 
-    def test_move_clamped_to_bounds(self):
-        crop = CropState(8000, 3000)
+    def test_move_clamped_to_bounds(self, crop):
         crop.zoom = 1.0
         # Try to move way past the right edge
         crop.move(50000, 0)
         assert crop.crop_x >= 0
         assert crop.crop_x + crop.crop_w <= 8000
 
-    def test_zoom_in(self):
-        crop = CropState(8000, 3000)
+    def test_zoom_in(self, crop):
         crop.zoom = 1.0
         crop.adjust_zoom(0.1)
         assert crop.zoom == pytest.approx(1.1, abs=0.01)
         assert crop.crop_w < 1920  # Crop gets smaller when zoomed in
 
-    def test_zoom_out_to_full_pano(self):
-        crop = CropState(8000, 3000)
-        crop.zoom = 0.2
-        crop.adjust_zoom(-0.2)
-        assert crop.zoom == 0.0
-
-    def test_zoom_max_clamped(self):
-        crop = CropState(8000, 3000)
-        crop.zoom = 1.2
-        crop.adjust_zoom(0.5)
-        assert crop.zoom == 1.2  # Should not exceed max
+    @pytest.mark.parametrize("start,delta,expected", [
+        (0.2, -0.2, 0.0),  # Out to full pano
+        (1.2, 0.5, 1.2),   # Should not exceed max
+    ], ids=["out_to_full_pano", "max_clamped"])
+    def test_zoom_limits(self, crop, start, delta, expected):
+        crop.zoom = start
+        crop.adjust_zoom(delta)
+        assert crop.zoom == expected
 
 
 class TestInteractiveViewer:
-    def test_opens_video_and_reads_metadata(self, tmp_path):
-        video_path = make_test_video(tmp_path)
+    def test_opens_video_and_reads_metadata(self, make_video):
+        video_path = make_video()
         viewer = InteractiveViewer(video_path)
         viewer.open_video()
 
-        assert viewer.pano_width == 800
-        assert viewer.pano_height == 400
-        assert viewer.total_frames == 30
+        assert viewer.pano_width == VIDEO_WIDTH
+        assert viewer.pano_height == VIDEO_HEIGHT
+        assert viewer.total_frames == VIDEO_FRAMES
         assert abs(viewer.fps - 30.0) < 1.0
 
         viewer.cap.release()
 
-    def test_crop_state_initialized_on_open(self, tmp_path):
-        video_path = make_test_video(tmp_path)
+    def test_crop_state_initialized_on_open(self, make_video):
+        video_path = make_video()
         viewer = InteractiveViewer(video_path)
         viewer.open_video()
 
         assert viewer.crop is not None
-        assert viewer.crop.pano_width == 800
-        assert viewer.crop.pano_height == 400
+        assert viewer.crop.pano_width == VIDEO_WIDTH
+        assert viewer.crop.pano_height == VIDEO_HEIGHT
 
         viewer.cap.release()
 
-    def test_headless_run_processes_all_frames(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        assert viewer.current_frame == 10
-        assert len(viewer.log_rows) == 10
+    def test_headless_run_processes_all_frames(self, played_viewer):
+        assert played_viewer.current_frame == 10
+        assert len(played_viewer.log_rows) == 10
 
-    def test_headless_run_max_frames(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=30)
+    def test_headless_run_max_frames(self, make_video):
+        # Only needs to outlast max_frames to prove the early exit
+        video_path = make_video(num_frames=10)
         viewer = InteractiveViewer(video_path)
         viewer.run(headless=True, max_frames=5)
 
+        assert viewer.total_frames == 10
         assert viewer.current_frame == 5
         assert len(viewer.log_rows) == 5
 
-    def test_log_has_correct_columns(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=5)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
+    def test_log_has_correct_columns(self, played_viewer):
         expected_keys = {
             "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
             "home_score", "away_score", "clock_running", "clock_seconds",
             "half", "scoreboard_visible"
         }
-        for row in viewer.log_rows:
+        for row in played_viewer.log_rows:
             assert set(row.keys()) == expected_keys
 
-    def test_log_frame_numbers_increment(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        for i, row in enumerate(viewer.log_rows):
+    def test_log_frame_numbers_increment(self, played_viewer):
+        for i, row in enumerate(played_viewer.log_rows):
             assert row["frame"] == i
 
-    def test_save_log_writes_csv(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=5)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
+    def test_save_log_writes_csv(self, tmp_path, played_viewer):
         log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
+        played_viewer.save_log(log_path)
 
         assert os.path.exists(log_path)
 
         # Read and verify CSV
-        import csv
         with open(log_path) as f:
             reader = csv.DictReader(f)
             rows = list(reader)
 
-        assert len(rows) == 5
+        assert len(rows) == 10
         assert rows[0]["frame"] == "0"
         assert "crop_x" in rows[0]
 
-    def test_scoreboard_state_defaults(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        assert viewer.home_score == 0
-        assert viewer.away_score == 0
-        assert viewer.half == 1
-        assert viewer.scoreboard_visible is True
+    def test_scoreboard_state_defaults(self, played_viewer):
+        assert played_viewer.home_score == 0
+        assert played_viewer.away_score == 0
+        assert played_viewer.half == 1
+        assert played_viewer.scoreboard_visible is True
 
-    def test_clock_ticks_when_running(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=30, fps=30.0)
+    def test_clock_ticks_when_running(self, make_video):
+        video_path = make_video(num_frames=30, fps=30.0)
         viewer = InteractiveViewer(video_path)
         viewer.open_video()
 
@@ -204,15 +169,15 @@ class TestInteractiveViewer:
 
 
 class TestScoreboardIntegration:
-    def test_scoreboard_renderer_initialized(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
+    def test_scoreboard_renderer_initialized(self, make_video):
+        video_path = make_video(num_frames=1)
         viewer = InteractiveViewer(video_path)
         viewer.open_video()
         assert viewer.scoreboard_renderer is not None
         viewer.cap.release()
 
-    def test_get_scoreboard_state(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
+    def test_get_scoreboard_state(self, make_video):
+        video_path = make_video(num_frames=1)
         viewer = InteractiveViewer(video_path, config={
             "home_team": "Eagles", "away_team": "Hawks"
         })
@@ -234,9 +199,9 @@ class TestScoreboardIntegration:
 
         viewer.cap.release()
 
-    def test_scoreboard_state_changes_in_log(self, tmp_path):
+    def test_scoreboard_state_changes_in_log(self, make_video):
         """Verify score changes appear in log at correct frames."""
-        video_path = make_test_video(tmp_path, num_frames=10)
+        video_path = make_video(num_frames=10)
         viewer = InteractiveViewer(video_path)
 
         # Run 3 frames, then change score, run 3 more
@@ -245,8 +210,7 @@ class TestScoreboardIntegration:
 
         # Process frames manually in headless mode
         for i in range(10):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 3:
                 viewer.home_score = 1
@@ -266,15 +230,14 @@ class TestScoreboardIntegration:
         assert viewer.log_rows[5]["away_score"] == 0
         assert viewer.log_rows[6]["away_score"] == 1
 
-    def test_visibility_toggle_in_log(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=5)
+    def test_visibility_toggle_in_log(self, make_video):
+        video_path = make_video(num_frames=5)
         viewer = InteractiveViewer(video_path)
         viewer.open_video()
         viewer.running = True
 
         for i in range(5):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 2:
                 viewer.scoreboard_visible = False
@@ -287,10 +250,20 @@ class TestScoreboardIntegration:
         assert viewer.log_rows[2]["scoreboard_visible"] == "false"
 
 
+@pytest.fixture(scope="class")
+def config_video(make_video):
+    return make_video(num_frames=1)
+
+
+@pytest.fixture(scope="class")
+def default_viewer(config_video):
+    """Viewer with default config, shared by tests that only read its settings."""
+    return InteractiveViewer(config_video)
+
+
 class TestJoystickConfig:
-    def test_default_controller_mapping(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
-        viewer = InteractiveViewer(video_path)
+    def test_default_controller_mapping(self, default_viewer):
+        viewer = default_viewer
 
         assert viewer.axis_pan == 0
         assert viewer.axis_tilt == 1
@@ -302,8 +275,8 @@ class TestJoystickConfig:
         assert viewer.button_wide_view == 2
         assert viewer.deadzone == 0.10
 
-    def test_custom_controller_mapping(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
+    def test_custom_controller_mapping(self, config_video):
+        video_path = config_video
         config = {
             "controller": {
                 "axis_pan": 2,
@@ -318,8 +291,8 @@ class TestJoystickConfig:
         # Defaults for unspecified
         assert viewer.axis_zoom_in == 5
 
-    def test_snap_positions_from_config(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=1)
+    def test_snap_positions_from_config(self, config_video):
+        video_path = config_video
         config = {
             "snap_center_x": 4000,
             "snap_left_goal_x": 500,
@@ -332,10 +305,10 @@ class TestJoystickConfig:
         assert viewer.snap_right_goal_x == 7500
         assert viewer.snap_y == 1494
 
-    def test_joystick_handle_without_controller(self, tmp_path):
+    def test_joystick_handle_without_controller(self, config_video):
         """handle_joystick should not crash when no controller is connected."""
-        video_path = make_test_video(tmp_path, num_frames=1)
-        viewer = InteractiveViewer(video_path)
+        # Opens the video, so it gets its own viewer rather than the shared one
+        viewer = InteractiveViewer(config_video)
         viewer.open_video()
         # joystick is None, should not raise
         viewer.handle_joystick()
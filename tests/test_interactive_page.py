@@ -8,9 +8,12 @@ Verifies:
 """
 
 import csv
+import io
+import itertools
 import os
 import sys
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,9 +26,13 @@ format_duration = interactive_page.format_duration
 CONTROLS_CARD = interactive_page.CONTROLS_CARD
 
 
-def make_test_log(tmp_path, num_frames=30, score_changes=None):
-    """Create a test session log CSV."""
-    path = str(tmp_path / "session.csv")
+def make_test_log(tmp_path, num_frames=30, score_changes=None, to_memory=False):
+    """
+    Create a test session log CSV.
+
+    Returns the file path, or with to_memory=True a rewound io.StringIO
+    holding the same CSV (tmp_path is then unused).
+    """
     fieldnames = [
         "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
         "home_score", "away_score", "clock_running", "clock_seconds",
@@ -35,28 +42,37 @@ def make_test_log(tmp_path, num_frames=30, score_changes=None):
     if score_changes is None:
         score_changes = {10: (1, 0), 20: (1, 1)}
 
+    # Build each column at once; only score and half vary per frame
+    frames = np.arange(num_frames)
+    home = np.zeros(num_frames, dtype=int)
+    away = np.zeros(num_frames, dtype=int)
+    for start, (h, a) in sorted(score_changes.items()):
+        home[start:] = h
+        away[start:] = a
+    timestamps = np.char.mod("%.3f", frames / 30)
+    half = np.where(frames < 15, 1, 2)
+    const = itertools.repeat
+
+    rows = zip(
+        frames.tolist(), timestamps.tolist(),
+        const(100), const(100), const(960), const(540),
+        home.tolist(), away.tolist(), const("true"), frames.tolist(),
+        half.tolist(), const("true"),
+    )
+
+    if to_memory:
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
+        buf.seek(0)
+        return buf
+
+    path = str(tmp_path / "session.csv")
     with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        home, away = 0, 0
-        for i in range(num_frames):
-            if i in score_changes:
-                home, away = score_changes[i]
-            writer.writerow({
-                "frame": i,
-                "timestamp": f"{i/30:.3f}",
-                "crop_x": 100,
-                "crop_y": 100,
-                "crop_w": 960,
-                "crop_h": 540,
-                "home_score": home,
-                "away_score": away,
-                "clock_running": "true",
-                "clock_seconds": i,
-                "half": 1 if i < 15 else 2,
-                "scoreboard_visible": "true",
-            })
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(rows)
 
     return path
 
@@ -73,25 +89,31 @@ class TestGetSessionSummary:
         assert summary["away_score"] == "1"
         assert summary["log_path"] == log_path
 
-    def test_score_changes_counted(self, tmp_path):
+    def test_score_changes_counted(self):
         """Verify score change counting."""
-        log_path = make_test_log(tmp_path, num_frames=30,
-                                score_changes={5: (1, 0), 10: (2, 0), 20: (2, 1)})
-        summary = get_session_summary(log_path)
+        log = make_test_log(None, num_frames=30, to_memory=True,
+                            score_changes={5: (1, 0), 10: (2, 0), 20: (2, 1)})
+        summary = get_session_summary(log)
         assert summary["score_changes"] == 3
 
-    def test_no_score_changes(self, tmp_path):
+    def test_no_score_changes(self):
         """Verify zero score changes when score never changes."""
-        log_path = make_test_log(tmp_path, num_frames=10, score_changes={})
-        summary = get_session_summary(log_path)
+        log = make_test_log(None, num_frames=10, score_changes={}, to_memory=True)
+        summary = get_session_summary(log)
         assert summary["score_changes"] == 0
 
-    def test_duration_from_timestamp(self, tmp_path):
+    def test_duration_from_timestamp(self):
         """Verify duration is read from the last timestamp."""
-        log_path = make_test_log(tmp_path, num_frames=60)
-        summary = get_session_summary(log_path)
+        log = make_test_log(None, num_frames=60, to_memory=True)
+        summary = get_session_summary(log)
         assert summary["duration"] > 0
 
+    def test_file_like_source(self):
+        """An in-memory log is summarized without a path."""
+        summary = get_session_summary(make_test_log(None, to_memory=True))
+        assert summary["total_frames"] == 30
+        assert summary["log_path"] is None
+
     def test_nonexistent_log_returns_none(self):
         """Verify graceful handling of missing log."""
         summary = get_session_summary("/nonexistent/log.csv")
@@ -12,8 +12,8 @@ Verifies:
 import csv
 import os
 import sys
+from collections import namedtuple
 
-import cv2
 import numpy as np
 import pytest
 
@@ -21,17 +21,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from interactive import InteractiveViewer
 
-
-def make_test_video(tmp_path, width=800, height=400, num_frames=30, fps=30.0):
-    path = str(tmp_path / "test_pano.mp4")
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
-    rng = np.random.RandomState(42)
-    for i in range(num_frames):
-        frame = rng.randint(50, 200, (height, width, 3), dtype=np.uint8)
-        writer.write(frame)
-    writer.release()
-    return path
+from helpers import FakeCapture
 
 
 EXPECTED_COLUMNS = [
@@ -41,86 +31,59 @@ EXPECTED_COLUMNS = [
 ]
 
 
-class TestCSVLogging:
-    def test_csv_file_is_written(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        log_path = str(tmp_path / "test_log.csv")
-        result = viewer.save_log(log_path)
-        assert result == log_path
-        assert os.path.exists(log_path)
+LOGGED_FRAMES = 20
 
-    def test_csv_has_correct_columns(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=5)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
+LoggedSession = namedtuple("LoggedSession", ["viewer", "log_path", "result", "rows"])
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
 
-        with open(log_path) as f:
-            reader = csv.reader(f)
-            header = next(reader)
+# The shape checks only read the log, so run the viewer and save it once.
+# Logging never looks at pixels, so frames come from memory, not a video.
+@pytest.fixture(scope="module")
+def logged_viewer(tmp_path_factory):
+    viewer = InteractiveViewer("test_pano.mp4", capture=FakeCapture(LOGGED_FRAMES))
+    viewer.run(headless=True)
 
-        assert header == EXPECTED_COLUMNS
+    log_path = str(tmp_path_factory.mktemp("log") / "test_log.csv")
+    result = viewer.save_log(log_path)
 
-    def test_csv_row_count_matches_frames(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=15)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
+    with open(log_path) as f:
+        rows = list(csv.DictReader(f))
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
+    return LoggedSession(viewer, log_path, result, rows)
 
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
 
-        assert len(rows) == 15
+class TestCSVLogging:
+    def test_csv_file_is_written(self, logged_viewer):
+        assert logged_viewer.result == logged_viewer.log_path
+        assert os.path.exists(logged_viewer.log_path)
 
-    def test_timestamps_increment(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=20, fps=30.0)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
+    def test_csv_has_correct_columns(self, logged_viewer):
+        with open(logged_viewer.log_path) as f:
+            reader = csv.reader(f)
+            header = next(reader)
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
+        assert header == EXPECTED_COLUMNS
 
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+    def test_csv_row_count_matches_frames(self, logged_viewer):
+        assert len(logged_viewer.rows) == LOGGED_FRAMES
 
-        timestamps = [float(r["timestamp"]) for r in rows]
+    def test_timestamps_increment(self, logged_viewer):
+        timestamps = [float(r["timestamp"]) for r in logged_viewer.rows]
         for i in range(1, len(timestamps)):
             assert timestamps[i] > timestamps[i-1], \
                 f"Timestamp not increasing at row {i}: {timestamps[i]} <= {timestamps[i-1]}"
 
-    def test_frame_numbers_sequential(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
-
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-        for i, row in enumerate(rows):
+    def test_frame_numbers_sequential(self, logged_viewer):
+        for i, row in enumerate(logged_viewer.rows):
             assert int(row["frame"]) == i
 
-    def test_score_changes_recorded(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
+    def test_score_changes_recorded(self):
+        viewer = InteractiveViewer("test_pano.mp4", capture=FakeCapture(10))
         viewer.open_video()
 
         # Simulate: frames 0-2 at 0-0, frame 3 home scores, frame 6 away scores
         for i in range(10):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 3:
                 viewer.home_score = 1
@@ -131,27 +94,20 @@ class TestCSVLogging:
 
         viewer.cap.release()
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
-
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        rows = viewer.log_rows
 
         # Score should change at frame 3 and 6
-        assert rows[2]["home_score"] == "0"
-        assert rows[3]["home_score"] == "1"
-        assert rows[5]["away_score"] == "0"
-        assert rows[6]["away_score"] == "1"
-
-    def test_clock_running_recorded(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
+        assert rows[2]["home_score"] == 0
+        assert rows[3]["home_score"] == 1
+        assert rows[5]["away_score"] == 0
+        assert rows[6]["away_score"] == 1
+
+    def test_clock_running_recorded(self):
+        viewer = InteractiveViewer("test_pano.mp4", capture=FakeCapture(10))
         viewer.open_video()
 
         for i in range(10):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 3:
                 viewer.clock_running = True
@@ -162,24 +118,17 @@ class TestCSVLogging:
 
         viewer.cap.release()
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
-
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        rows = viewer.log_rows
 
         assert rows[2]["clock_running"] == "false"
         assert rows[3]["clock_running"] == "true"
 
-    def test_half_change_recorded(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
+    def test_half_change_recorded(self):
+        viewer = InteractiveViewer("test_pano.mp4", capture=FakeCapture(10))
         viewer.open_video()
 
         for i in range(10):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 5:
                 viewer.half = 2
@@ -189,36 +138,23 @@ class TestCSVLogging:
 
         viewer.cap.release()
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
-
-        with open(log_path) as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-        assert rows[4]["half"] == "1"
-        assert rows[5]["half"] == "2"
-
-    def test_crop_coords_in_valid_range(self, tmp_path):
-        video_path = make_test_video(tmp_path, width=800, height=400, num_frames=5)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
-
-        for row in viewer.log_rows:
-            assert int(row["crop_x"]) >= 0
-            assert int(row["crop_y"]) >= 0
-            assert int(row["crop_w"]) > 0
-            assert int(row["crop_h"]) > 0
+        rows = viewer.log_rows
 
-    def test_column_count_per_row(self, tmp_path):
-        video_path = make_test_video(tmp_path, num_frames=5)
-        viewer = InteractiveViewer(video_path)
-        viewer.run(headless=True)
+        assert rows[4]["half"] == 1
+        assert rows[5]["half"] == 2
 
-        log_path = str(tmp_path / "test_log.csv")
-        viewer.save_log(log_path)
+    def test_crop_coords_in_valid_range(self, logged_viewer):
+        x, y, w, h = np.array([
+            [row["crop_x"], row["crop_y"], row["crop_w"], row["crop_h"]]
+            for row in logged_viewer.viewer.log_rows
+        ]).T
+        assert (x >= 0).all()
+        assert (y >= 0).all()
+        assert (w > 0).all()
+        assert (h > 0).all()
 
-        with open(log_path) as f:
+    def test_column_count_per_row(self, logged_viewer):
+        with open(logged_viewer.log_path) as f:
             reader = csv.reader(f)
             header = next(reader)
             expected_count = len(header)
@@ -17,40 +17,61 @@ from scipy.io import wavfile
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from calibrate import calibrate
-from sync_audio import cross_correlate_offset
+from sync_audio import sync_audio
 from stitch import stitch_videos, get_video_info
 
 
-def make_full_test_pair(tmp_path, num_frames=30, width=400, height=300,
+BASE_AUDIO_SECONDS = 5.0
+
+
+# Every pair cuts its audio from the same signal, so build it once
+@pytest.fixture(scope="session")
+def base_audio():
+    """(sample_rate, signal): noise plus a 440 Hz tone, float32 in [-1, 1]."""
+    sr = 16000
+    total_samples = int(BASE_AUDIO_SECONDS * sr)
+    rng = np.random.default_rng(7)
+    t = np.arange(total_samples) / sr
+    signal = rng.standard_normal(total_samples, dtype=np.float32)
+    signal *= 0.3
+    signal += 0.2 * np.sin(2 * np.pi * 440 * t)
+    np.clip(signal, -1.0, 1.0, out=signal)
+    signal.setflags(write=False)
+    return sr, signal
+
+
+def make_full_test_pair(tmp_path, base_audio, num_frames=30, width=400, height=300,
                         overlap_px=120, fps=30.0, audio_offset_seconds=0.5):
     """
     Create a full test scenario:
     - Two video files with known overlap
-    - Two audio files (WAV) with known offset
+    - Two audio files (WAV) with known offset, cut from base_audio
     """
     full_width = 2 * width - overlap_px
-    rng = np.random.RandomState(42)
+    rng = np.random.default_rng(42)
 
     # Base frame with features
-    base_frame = rng.randint(50, 200, (height, full_width, 3), dtype=np.uint8)
+    base_frame = rng.integers(50, 200, (height, full_width, 3), dtype=np.uint8)
     for _ in range(30):
-        cx = rng.randint(0, full_width)
-        cy = rng.randint(0, height)
-        r = rng.randint(10, 30)
-        color = tuple(int(c) for c in rng.randint(0, 256, 3))
+        cx = rng.integers(0, full_width)
+        cy = rng.integers(0, height)
+        r = rng.integers(10, 30)
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
         cv2.circle(base_frame, (cx, cy), r, color, -1)
     base_frame = cv2.GaussianBlur(base_frame, (5, 5), 1.0)
 
-    left_path = str(tmp_path / "left.mp4")
-    right_path = str(tmp_path / "right.mp4")
+    left_path = str(tmp_path / "left.avi")
+    right_path = str(tmp_path / "right.avi")
 
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    fourcc = cv2.VideoWriter_fourcc(*"I420")
     writer_left = cv2.VideoWriter(left_path, fourcc, fps, (width, height))
     writer_right = cv2.VideoWriter(right_path, fourcc, fps, (width, height))
 
-    for i in range(num_frames):
-        noise = rng.randint(-3, 4, base_frame.shape, dtype=np.int16)
-        frame = np.clip(base_frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    # Noise for every frame in one vectorized pass; only the writes are per frame
+    noise = rng.integers(-3, 4, (num_frames,) + base_frame.shape, dtype=np.int16)
+    noise += base_frame
+    frames = np.clip(noise, 0, 255, out=noise).astype(np.uint8)
+    for frame in frames:
         writer_left.write(frame[:, :width])
         writer_right.write(frame[:, (width - overlap_px):])
 
@@ -58,16 +79,10 @@ def make_full_test_pair(tmp_path, num_frames=30, width=400, height=300,
     writer_right.release()
 
     # Create audio files with known offset for sync testing
-    sr = 16000
-    duration = num_frames / fps + abs(audio_offset_seconds) + 1
-    total_samples = int(duration * sr)
-    t = np.arange(total_samples) / sr
-    signal = (rng.randn(total_samples) * 0.3 +
-              0.2 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
-    signal = np.clip(signal, -1.0, 1.0)
-
+    sr, signal = base_audio
     audio_samples = int((num_frames / fps) * sr)
     offset_samples = int(audio_offset_seconds * sr)
+    assert offset_samples + audio_samples <= len(signal), "base_audio too short"
 
     left_audio = (signal[:audio_samples] * 32767).astype(np.int16)
     right_audio = (signal[offset_samples:offset_samples + audio_samples] * 32767).astype(np.int16)
@@ -92,69 +107,72 @@ def make_full_test_pair(tmp_path, num_frames=30, width=400, height=300,
     }
 
 
-class TestPhase1Integration:
-    def test_full_pipeline_calibrate_stitch(self, tmp_path):
-        """Full pipeline: calibrate → stitch (no audio sync, zero offset)."""
-        data = make_full_test_pair(tmp_path)
+def calibrate_pair(directory, base_audio, num_frames=30):
+    """make_full_test_pair plus calibrate; adds cal_data and cal_path."""
+    data = make_full_test_pair(directory, base_audio, num_frames=num_frames)
+    data["cal_data"] = calibrate(
+        data["left_video"], data["right_video"],
+        cal_date="integration-test",
+        output_dir=str(directory / "cal"),
+        frame_index=0,
+        overlap_fraction=0.4
+    )
+    data["cal_path"] = str(directory / "cal" / "integration-test_cal.json")
+    return data
+
+
+# Calibration (SIFT + RANSAC) and the zero-offset stitch are the expensive
+# steps and their outputs are only read, so each runs once per session
+@pytest.fixture(scope="session")
+def calibrated_pair(tmp_path_factory, base_audio):
+    return calibrate_pair(tmp_path_factory.mktemp("p1"), base_audio)
+
+
+@pytest.fixture(scope="session")
+def stitched_output(tmp_path_factory, calibrated_pair):
+    """calibrated_pair stitched at zero offset: (output_path, video info)."""
+    data = calibrated_pair
+    output_path = str(tmp_path_factory.mktemp("p1_stitched") / "stitched.mp4")
+    stitch_videos(
+        data["left_video"], data["right_video"],
+        output_path,
+        cal_path=data["cal_path"],
+        frame_offset=0
+    )
+    return output_path, get_video_info(output_path)
 
-        # Step 1: Calibrate
-        cal_data = calibrate(
-            data["left_video"], data["right_video"],
-            cal_date="integration-test",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
-        cal_path = str(tmp_path / "cal" / "integration-test_cal.json")
-        assert os.path.exists(cal_path)
 
-        # Step 2: Stitch
-        output_path = str(tmp_path / "stitched.mp4")
-        stitch_videos(
-            data["left_video"], data["right_video"],
-            output_path,
-            cal_path=cal_path,
-            frame_offset=0
-        )
+class TestPhase1Integration:
+    def test_full_pipeline_calibrate_stitch(self, calibrated_pair, stitched_output):
+        """Full pipeline: calibrate → stitch (no audio sync, zero offset)."""
+        data = calibrated_pair
+        assert os.path.exists(data["cal_path"])
 
         # Verify output
+        output_path, info = stitched_output
         assert os.path.exists(output_path)
-        info = get_video_info(output_path)
         assert info["frame_count"] == data["num_frames"]
         assert info["width"] > data["width"]  # Panorama is wider than either input
         assert info["height"] >= data["height"]
 
-    def test_full_pipeline_with_audio_sync(self, tmp_path):
+    def test_full_pipeline_with_audio_sync(self, tmp_path, calibrated_pair):
         """Full pipeline: calibrate → audio sync → stitch."""
-        data = make_full_test_pair(tmp_path, audio_offset_seconds=0.5)
+        data = calibrated_pair
 
-        # Step 1: Calibrate
-        cal_data = calibrate(
-            data["left_video"], data["right_video"],
-            cal_date="integration-audio",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
-        cal_path = str(tmp_path / "cal" / "integration-audio_cal.json")
-
-        # Step 2: Audio sync
-        from sync_audio import load_audio
-        _, audio_left = load_audio(data["left_audio"])
-        _, audio_right = load_audio(data["right_audio"])
-        offset = cross_correlate_offset(audio_left, audio_right, 16000)
+        # Audio sync, decimated to SYNC_SAMPLE_RATE as in the real pipeline
+        offset = sync_audio(data["left_audio"], data["right_audio"])
 
         # Verify offset is approximately correct (within 1 frame at 30fps)
         assert abs(offset - data["audio_offset"]) < 1.0 / 30, \
             f"Audio offset {offset:.4f}s != expected {data['audio_offset']:.4f}s"
 
-        # Step 3: Stitch with offset
+        # Stitch with offset
         frame_offset = round(offset * data["fps"])
         output_path = str(tmp_path / "stitched.mp4")
         stitch_videos(
             data["left_video"], data["right_video"],
             output_path,
-            cal_path=cal_path,
+            cal_path=data["cal_path"],
             frame_offset=frame_offset
         )
 
@@ -162,17 +180,9 @@ class TestPhase1Integration:
         info = get_video_info(output_path)
         assert info["frame_count"] > 0
 
-    def test_calibration_json_integrity(self, tmp_path):
+    def test_calibration_json_integrity(self, calibrated_pair):
         """Verify calibration file has all required fields for downstream use."""
-        data = make_full_test_pair(tmp_path)
-
-        cal_data = calibrate(
-            data["left_video"], data["right_video"],
-            cal_date="integrity-test",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
+        cal_data = calibrated_pair["cal_data"]
 
         required_fields = [
             "homography", "canvas_width", "canvas_height",
@@ -193,26 +203,9 @@ class TestPhase1Integration:
         assert cal_data["canvas_height"] > 0
         assert cal_data["blend_x_start"] < cal_data["blend_x_end"]
 
-    def test_stitched_output_has_content(self, tmp_path):
+    def test_stitched_output_has_content(self, stitched_output):
         """Verify the stitched video frames actually have image content (not all black)."""
-        data = make_full_test_pair(tmp_path, num_frames=5)
-        output_path = str(tmp_path / "stitched.mp4")
-
-        cal_data = calibrate(
-            data["left_video"], data["right_video"],
-            cal_date="content-test",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
-        cal_path = str(tmp_path / "cal" / "content-test_cal.json")
-
-        stitch_videos(
-            data["left_video"], data["right_video"],
-            output_path,
-            cal_path=cal_path,
-            frame_offset=0
-        )
+        output_path, _ = stitched_output
 
         # Read back a frame and check it has content
         cap = cv2.VideoCapture(output_path)
@@ -1,18 +1,17 @@
 """
 Phase 2 Integration Test
 
-Runs a full interactive session (headless) on a sample video and verifies:
+Runs a full interactive session (headless) on an in-memory panorama source
+and verifies:
 1. All controls work together (crop movement, zoom, scoreboard)
-2. Log file is complete and consistent
+2. Session log is complete and consistent
 3. Scoreboard state changes are recorded
 4. Crop coordinates stay within bounds
 """
 
-import csv
 import os
 import sys
 
-import cv2
 import numpy as np
 import pytest
 
@@ -20,59 +19,42 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from interactive import InteractiveViewer
 
+from helpers import FakeCapture
 
-def make_panorama_video(tmp_path, width=1600, height=600, num_frames=60, fps=30.0):
-    """Create a synthetic panorama-like video."""
-    path = str(tmp_path / "test_panorama.mp4")
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
 
-    rng = np.random.RandomState(42)
-    base = rng.randint(30, 180, (height, width, 3), dtype=np.uint8)
+def make_panorama(num_frames, width=1600, height=600, fps=30.0):
+    """
+    Panorama-sized frame source; headless sessions never look at pixels.
 
-    # Add field-like features
-    cv2.line(base, (width // 2, 0), (width // 2, height), (255, 255, 255), 2)
-    cv2.circle(base, (width // 2, height // 2), 80, (255, 255, 255), 2)
-
-    for i in range(num_frames):
-        noise = rng.randint(-2, 3, base.shape, dtype=np.int16)
-        frame = np.clip(base.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-        # Moving ball
-        bx = int(width * (0.3 + 0.4 * np.sin(2 * np.pi * i / num_frames)))
-        by = height // 2
-        cv2.circle(frame, (bx, by), 10, (0, 255, 255), -1)
-        writer.write(frame)
-
-    writer.release()
-    return path
+    For the crop to move, the panorama must exceed the viewer's fixed
+    1920x1080 crop window.
+    """
+    return FakeCapture(num_frames, width=width, height=height, fps=fps)
 
 
 class TestPhase2Integration:
-    def test_full_session_headless(self, tmp_path):
+    def test_full_session_headless(self):
         """Run a full headless session and verify all state."""
-        video_path = make_panorama_video(tmp_path, num_frames=60)
-        viewer = InteractiveViewer(video_path, config={
+        viewer = InteractiveViewer("panorama.mp4", config={
             "home_team": "Eagles",
             "away_team": "Hawks",
             "home_color": "#1E5E3A",
             "away_color": "#5E1E1E",
-        })
+        }, capture=make_panorama(60))
 
         viewer.run(headless=True)
 
         assert viewer.current_frame == 60
         assert len(viewer.log_rows) == 60
 
-    def test_session_with_score_changes(self, tmp_path):
+    def test_session_with_score_changes(self):
         """Simulate score changes during a session."""
-        video_path = make_panorama_video(tmp_path, num_frames=30)
-        viewer = InteractiveViewer(video_path)
+        viewer = InteractiveViewer("panorama.mp4", capture=make_panorama(30))
         viewer.open_video()
         viewer.running = True
 
         for i in range(30):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             # Simulate events
             if i == 5:
@@ -95,37 +77,30 @@ class TestPhase2Integration:
 
         viewer.cap.release()
 
-        log_path = str(tmp_path / "session.csv")
-        viewer.save_log(log_path)
-
         # Verify log
-        with open(log_path) as f:
-            rows = list(csv.DictReader(f))
-
+        rows = viewer.log_rows
         assert len(rows) == 30
 
         # Score at various points
-        assert rows[9]["home_score"] == "0"
-        assert rows[10]["home_score"] == "1"
-        assert rows[19]["away_score"] == "0"
-        assert rows[20]["away_score"] == "1"
-        assert rows[25]["home_score"] == "2"
+        assert rows[9]["home_score"] == 0
+        assert rows[10]["home_score"] == 1
+        assert rows[19]["away_score"] == 0
+        assert rows[20]["away_score"] == 1
+        assert rows[25]["home_score"] == 2
 
         # Half change
-        assert rows[14]["half"] == "1"
-        assert rows[15]["half"] == "2"
+        assert rows[14]["half"] == 1
+        assert rows[15]["half"] == 2
 
-    def test_crop_movement_recorded(self, tmp_path):
+    def test_crop_movement_recorded(self):
         """Verify crop position changes are logged."""
         # Use a wide panorama so crop can actually move
-        video_path = make_panorama_video(tmp_path, width=4000, height=1500, num_frames=20)
-        viewer = InteractiveViewer(video_path)
+        viewer = InteractiveViewer("panorama.mp4", capture=make_panorama(20, 2400, 1350))
         viewer.open_video()
         viewer.running = True
 
         for i in range(20):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             # Move crop to the right each frame
             if i > 5:
@@ -139,16 +114,14 @@ class TestPhase2Integration:
         x_values = [int(r["crop_x"]) for r in viewer.log_rows]
         assert x_values[10] > x_values[5], "Crop should have moved right"
 
-    def test_zoom_changes_recorded(self, tmp_path):
+    def test_zoom_changes_recorded(self):
         """Verify zoom (crop_w/crop_h) changes are logged."""
-        video_path = make_panorama_video(tmp_path, num_frames=20)
-        viewer = InteractiveViewer(video_path)
+        viewer = InteractiveViewer("panorama.mp4", capture=make_panorama(20))
         viewer.open_video()
         viewer.running = True
 
         for i in range(20):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             if i == 10:
                 viewer.crop.adjust_zoom(0.1)  # Zoom in
@@ -162,17 +135,15 @@ class TestPhase2Integration:
         w_after = int(viewer.log_rows[10]["crop_w"])
         assert w_after < w_before, f"Expected crop_w to decrease: {w_before} -> {w_after}"
 
-    def test_log_all_bounds_valid(self, tmp_path):
+    def test_log_all_bounds_valid(self):
         """Verify all crop coords stay within panorama bounds."""
-        pano_w, pano_h = 4000, 1500
-        video_path = make_panorama_video(tmp_path, width=pano_w, height=pano_h, num_frames=30)
-        viewer = InteractiveViewer(video_path)
+        pano_w, pano_h = 2400, 1350
+        viewer = InteractiveViewer("panorama.mp4", capture=make_panorama(30, pano_w, pano_h))
         viewer.open_video()
         viewer.running = True
 
         for i in range(30):
-            ret, frame = viewer.cap.read()
-            if not ret:
+            if not viewer.cap.grab():
                 break
             # Aggressive movement
             viewer.crop.move(50 if i % 2 == 0 else -50, 20 if i % 3 == 0 else -20)
@@ -181,20 +152,18 @@ class TestPhase2Integration:
 
         viewer.cap.release()
 
-        for row in viewer.log_rows:
-            x = int(row["crop_x"])
-            y = int(row["crop_y"])
-            w = int(row["crop_w"])
-            h = int(row["crop_h"])
-            assert x >= 0
-            assert y >= 0
-            assert x + w <= pano_w
-            assert y + h <= pano_h
-
-    def test_scoreboard_renderer_works_in_session(self, tmp_path):
+        x, y, w, h = np.array([
+            [row["crop_x"], row["crop_y"], row["crop_w"], row["crop_h"]]
+            for row in viewer.log_rows
+        ]).T
+        assert (x >= 0).all()
+        assert (y >= 0).all()
+        assert (x + w <= pano_w).all()
+        assert (y + h <= pano_h).all()
+
+    def test_scoreboard_renderer_works_in_session(self):
         """Verify scoreboard rendering doesn't crash during session."""
-        video_path = make_panorama_video(tmp_path, num_frames=10)
-        viewer = InteractiveViewer(video_path)
+        viewer = InteractiveViewer("panorama.mp4", capture=make_panorama(10))
         viewer.open_video()
 
         # Verify scoreboard renderer was initialized
@@ -7,6 +7,9 @@ Verifies:
 3. Frame count matches log rows
 4. Scoreboard is visible in output frames
 5. Crop positions are applied correctly
+
+Every render case is independent, so the module spreads cleanly across
+workers with ``pytest -n auto``.
 """
 
 import csv
@@ -20,17 +23,25 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from render import render_broadcast, read_log
+from stitch import get_video_info
 
 
-def make_test_panorama(tmp_path, width=2000, height=1200, num_frames=20, fps=30.0):
+def make_test_panorama(tmp_path, width=1280, height=720, num_frames=20, fps=30.0):
     """Create a synthetic panoramic video with visible features."""
-    path = str(tmp_path / "panorama.mp4")
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    # Uncompressed I420: render only decodes this, and mp4v spends most of
+    # its time compressing noise that is never compared
+    path = str(tmp_path / "panorama.avi")
+    fourcc = cv2.VideoWriter_fourcc(*"I420")
     writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
 
-    rng = np.random.RandomState(42)
+    # One frame buffer reused for every frame, refilled with raw random bytes
+    # folded into [30, 180) (much cheaper than randint at this size)
+    rng = np.random.default_rng(42)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
     for i in range(num_frames):
-        frame = rng.randint(30, 180, (height, width, 3), dtype=np.uint8)
+        noise = np.frombuffer(rng.bytes(frame.size), dtype=np.uint8).reshape(frame.shape)
+        np.remainder(noise, 150, out=frame)
+        frame += 30
         # Add a distinguishing feature at center
         cv2.circle(frame, (width // 2, height // 2), 50, (0, 255, 0), -1)
         # Add frame number text
@@ -42,38 +53,54 @@ def make_test_panorama(tmp_path, width=2000, height=1200, num_frames=20, fps=30.
     return path
 
 
+LOG_FIELDNAMES = [
+    "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
+    "home_score", "away_score", "clock_running", "clock_seconds",
+    "half", "scoreboard_visible"
+]
+
+
 def make_test_log(tmp_path, num_frames=20, crop_x=40, crop_y=60,
                   crop_w=960, crop_h=540):
     """Create a test log CSV."""
     path = str(tmp_path / "test_log.csv")
-    fieldnames = [
-        "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
-        "home_score", "away_score", "clock_running", "clock_seconds",
-        "half", "scoreboard_visible"
+    crop = (crop_x, crop_y, crop_w, crop_h)
+    rows = [
+        (i, f"{i/30:.3f}") + crop + (
+            1 if i >= 10 else 0,              # home_score
+            0,                                # away_score
+            "true" if i >= 2 else "false",    # clock_running
+            max(0, i - 2),                    # clock_seconds
+            1,                                # half
+            "true",                           # scoreboard_visible
+        )
+        for i in range(num_frames)
     ]
-
     with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for i in range(num_frames):
-            writer.writerow({
-                "frame": i,
-                "timestamp": f"{i/30:.3f}",
-                "crop_x": crop_x,
-                "crop_y": crop_y,
-                "crop_w": crop_w,
-                "crop_h": crop_h,
-                "home_score": 1 if i >= 10 else 0,
-                "away_score": 0,
-                "clock_running": "true" if i >= 2 else "false",
-                "clock_seconds": max(0, i - 2),
-                "half": 1,
-                "scoreboard_visible": "true",
-            })
+        writer = csv.writer(f)
+        writer.writerow(LOG_FIELDNAMES)
+        writer.writerows(rows)
 
     return path
 
 
+# Panorama x offsets used by the crop position tests
+CROP_POSITIONS = {"left": 0, "right": 320}
+
+
+@pytest.fixture(scope="module")
+def expected_crops(video_factory):
+    """First panorama frame cropped and scaled as render would, per position."""
+    video_path = video_factory(make_test_panorama, num_frames=5)
+    cap = cv2.VideoCapture(video_path)
+    _, source = cap.read()
+    cap.release()
+    return {
+        name: cv2.resize(source[0:540, x:x + 960], (640, 360)).astype(np.int16)
+        for name, x in CROP_POSITIONS.items()
+    }
+
+
 class TestReadLog:
     def test_reads_correct_row_count(self, tmp_path):
         log_path = make_test_log(tmp_path, num_frames=15)
@@ -90,8 +117,8 @@ class TestReadLog:
 
 
 class TestRenderBroadcast:
-    def test_output_exists(self, tmp_path):
-        video_path = make_test_panorama(tmp_path, num_frames=10)
+    def test_output_exists(self, tmp_path, video_factory):
+        video_path = video_factory(make_test_panorama, num_frames=10)
         log_path = make_test_log(tmp_path, num_frames=10)
         output_path = str(tmp_path / "broadcast.mp4")
 
@@ -103,8 +130,8 @@ class TestRenderBroadcast:
         assert os.path.exists(output_path)
         assert os.path.getsize(output_path) > 0
 
-    def test_output_resolution(self, tmp_path):
-        video_path = make_test_panorama(tmp_path, num_frames=5)
+    def test_output_resolution(self, tmp_path, video_factory):
+        video_path = video_factory(make_test_panorama, num_frames=5)
         log_path = make_test_log(tmp_path, num_frames=5)
         output_path = str(tmp_path / "broadcast.mp4")
 
@@ -113,16 +140,12 @@ class TestRenderBroadcast:
             output_width=640, output_height=360, output_fps=30.0
         )
 
-        cap = cv2.VideoCapture(output_path)
-        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
-
-        assert w == 640
-        assert h == 360
+        info = get_video_info(output_path)
+        assert info["width"] == 640
+        assert info["height"] == 360
 
-    def test_frame_count_matches_log(self, tmp_path):
-        video_path = make_test_panorama(tmp_path, num_frames=15)
+    def test_frame_count_matches_log(self, tmp_path, video_factory):
+        video_path = video_factory(make_test_panorama, num_frames=15)
         log_path = make_test_log(tmp_path, num_frames=15)
         output_path = str(tmp_path / "broadcast.mp4")
 
@@ -131,15 +154,11 @@ class TestRenderBroadcast:
             output_width=640, output_height=360
         )
 
-        cap = cv2.VideoCapture(output_path)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        cap.release()
-
-        assert frame_count == 15
+        assert get_video_info(output_path)["frame_count"] == 15
 
-    def test_scoreboard_visible_in_output(self, tmp_path):
+    def test_scoreboard_visible_in_output(self, tmp_path, video_factory):
         """Verify scoreboard composite changes the output frame."""
-        video_path = make_test_panorama(tmp_path, num_frames=5)
+        video_path = video_factory(make_test_panorama, num_frames=5)
 
         # Create log with scoreboard visible
         visible_log = make_test_log(tmp_path, num_frames=5)
@@ -158,65 +177,38 @@ class TestRenderBroadcast:
         assert ret
 
         # The frame should have content (not all black)
-        assert frame_visible.sum() > 0
-
-    def test_crop_positions_applied(self, tmp_path):
-        """Verify different crop positions produce different outputs."""
-        video_path = make_test_panorama(tmp_path, width=2000, height=1200, num_frames=5)
-
-        # Log with crop at left
-        log_left = str(tmp_path / "log_left.csv")
-        fieldnames = [
-            "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
-            "home_score", "away_score", "clock_running", "clock_seconds",
-            "half", "scoreboard_visible"
-        ]
-        with open(log_left, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            for i in range(5):
-                w.writerow({
-                    "frame": i, "timestamp": f"{i/30:.3f}",
-                    "crop_x": 0, "crop_y": 0, "crop_w": 960, "crop_h": 540,
-                    "home_score": 0, "away_score": 0, "clock_running": "false",
-                    "clock_seconds": 0, "half": 1, "scoreboard_visible": "false"
-                })
-
-        # Log with crop at right
-        log_right = str(tmp_path / "log_right.csv")
-        with open(log_right, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            for i in range(5):
-                w.writerow({
-                    "frame": i, "timestamp": f"{i/30:.3f}",
-                    "crop_x": 1000, "crop_y": 0, "crop_w": 960, "crop_h": 540,
-                    "home_score": 0, "away_score": 0, "clock_running": "false",
-                    "clock_seconds": 0, "half": 1, "scoreboard_visible": "false"
-                })
-
-        out_left = str(tmp_path / "left.mp4")
-        out_right = str(tmp_path / "right.mp4")
-
-        render_broadcast(video_path, log_left, out_left,
-                         output_width=640, output_height=360)
-        render_broadcast(video_path, log_right, out_right,
-                         output_width=640, output_height=360)
+        assert frame_visible.any()
+
+    @pytest.mark.parametrize("position", ["left", "right"])
+    def test_crop_positions_applied(self, position, tmp_path, video_factory,
+                                    expected_crops):
+        """Each crop position renders its own region of the panorama.
+
+        The positions are separate cases so ``pytest -n auto`` can render
+        them on different workers.
+        """
+        video_path = video_factory(make_test_panorama, num_frames=5)
+        log_path = make_test_log(tmp_path, num_frames=5,
+                                 crop_x=CROP_POSITIONS[position], crop_y=0)
+        output_path = str(tmp_path / "broadcast.mp4")
 
-        # Read first frame from each
-        cap_l = cv2.VideoCapture(out_left)
-        _, frame_l = cap_l.read()
-        cap_l.release()
+        render_broadcast(video_path, log_path, output_path,
+                         output_width=640, output_height=360)
 
-        cap_r = cv2.VideoCapture(out_right)
-        _, frame_r = cap_r.read()
-        cap_r.release()
+        cap = cv2.VideoCapture(output_path)
+        ret, frame = cap.read()
+        cap.release()
+        assert ret
 
-        # Frames should be different (different crop positions)
-        assert not np.array_equal(frame_l, frame_r)
+        # The rendered frame should match its own crop far better than the other
+        errors = {
+            name: np.abs(frame.astype(np.int16) - expected).mean()
+            for name, expected in expected_crops.items()
+        }
+        assert min(errors, key=errors.get) == position
 
-    def test_progress_callback(self, tmp_path):
-        video_path = make_test_panorama(tmp_path, num_frames=5)
+    def test_progress_callback(self, tmp_path, video_factory):
+        video_path = video_factory(make_test_panorama, num_frames=5)
         log_path = make_test_log(tmp_path, num_frames=5)
         output_path = str(tmp_path / "broadcast.mp4")
 
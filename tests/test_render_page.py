@@ -22,30 +22,33 @@ read_log_summary = render_page.read_log_summary
 format_duration = render_page.format_duration
 
 
+LOG_FIELDNAMES = [
+    "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
+    "home_score", "away_score", "clock_running", "clock_seconds",
+    "half", "scoreboard_visible"
+]
+
+
 def make_test_log(tmp_path, num_frames=30, home_score=2, away_score=1):
     """Create a test session log."""
     path = str(tmp_path / "session.csv")
-    fieldnames = [
-        "frame", "timestamp", "crop_x", "crop_y", "crop_w", "crop_h",
-        "home_score", "away_score", "clock_running", "clock_seconds",
-        "half", "scoreboard_visible"
+    crop = (100, 100, 960, 540)
+    half_frame = num_frames // 2
+    rows = [
+        (i, f"{i/30:.3f}") + crop + (
+            home_score if i >= half_frame else 0,
+            away_score if i >= num_frames * 3 // 4 else 0,
+            "true",
+            i,
+            2 if i >= half_frame else 1,
+            "true",
+        )
+        for i in range(num_frames)
     ]
     with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for i in range(num_frames):
-            writer.writerow({
-                "frame": i,
-                "timestamp": f"{i/30:.3f}",
-                "crop_x": 100, "crop_y": 100,
-                "crop_w": 960, "crop_h": 540,
-                "home_score": home_score if i >= num_frames // 2 else 0,
-                "away_score": away_score if i >= num_frames * 3 // 4 else 0,
-                "clock_running": "true",
-                "clock_seconds": i,
-                "half": 2 if i >= num_frames // 2 else 1,
-                "scoreboard_visible": "true",
-            })
+        writer = csv.writer(f)
+        writer.writerow(LOG_FIELDNAMES)
+        writer.writerows(rows)
     return path
 
 
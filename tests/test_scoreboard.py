@@ -44,11 +44,13 @@ class TestScoreboardState:
         assert state.visible is True
 
 
-class TestScoreboardRenderer:
-    @pytest.fixture
-    def renderer(self):
-        return ScoreboardRenderer(1920, 1080)
+@pytest.fixture(scope="module")
+def renderer():
+    """One renderer for the module, so its font and layer caches are shared."""
+    return ScoreboardRenderer(1920, 1080)
+
 
+class TestScoreboardRenderer:
     def test_render_returns_rgba_image(self, renderer):
         state = ScoreboardState()
         img = renderer.render(state)
@@ -61,7 +63,7 @@ class TestScoreboardRenderer:
         img = renderer.render(state)
         arr = np.array(img)
         # Alpha channel should have non-zero values (the scoreboard bar)
-        assert arr[:, :, 3].sum() > 0
+        assert arr[:, :, 3].any()
 
     def test_render_zero_zero(self, renderer):
         """Test 0-0 score state."""
@@ -83,17 +85,15 @@ class TestScoreboardRenderer:
         img1 = renderer.render(state1)
         img2 = renderer.render(state2)
 
-        arr1 = np.array(img1)
-        arr2 = np.array(img2)
         # Images should differ (different half text)
-        assert not np.array_equal(arr1, arr2)
+        assert not np.array_equal(np.asarray(img1), np.asarray(img2))
 
     def test_render_invisible(self, renderer):
         """Test invisible state returns fully transparent image."""
         state = ScoreboardState(visible=False)
         img = renderer.render(state)
         arr = np.array(img)
-        assert arr[:, :, 3].sum() == 0
+        assert not arr[:, :, 3].any()
 
     def test_render_visibility_toggle(self, renderer):
         """Toggle visibility and verify output changes."""
@@ -106,8 +106,8 @@ class TestScoreboardRenderer:
         v_arr = np.array(visible_img)
         h_arr = np.array(hidden_img)
 
-        assert v_arr[:, :, 3].sum() > 0
-        assert h_arr[:, :, 3].sum() == 0
+        assert v_arr[:, :, 3].any()
+        assert not h_arr[:, :, 3].any()
 
     def test_render_custom_team_names(self, renderer):
         state = ScoreboardState(home_team="Eagles", away_team="Hawks")
@@ -126,9 +126,7 @@ class TestScoreboardRenderer:
         img1 = renderer.render(state1)
         img2 = renderer.render(state2)
 
-        arr1 = np.array(img1)
-        arr2 = np.array(img2)
-        assert not np.array_equal(arr1, arr2)
+        assert not np.array_equal(np.asarray(img1), np.asarray(img2))
 
     def test_render_top_position(self, renderer):
         """Test top position renders scoreboard near top of frame."""
@@ -141,12 +139,14 @@ class TestScoreboardRenderer:
         bottom_alpha = arr[-100:, :, 3].sum()
         assert top_alpha > bottom_alpha
 
-    def test_cache_returns_same_image(self, renderer):
+    def test_cache_returns_same_image(self):
+        renderer = ScoreboardRenderer(1920, 1080)
         state = ScoreboardState(home_score=1, away_score=0)
-        img1 = renderer.render(state)
-        img2 = renderer.render(state)
-        # Should be the exact same object (cached)
-        assert img1 is img2
+        renderer.render(state)
+        renderer.render(state)
+        # Second render of the same state is served from the cache
+        assert renderer.cache_misses == 1
+        assert renderer.cache_hits == 1
 
     def test_cache_invalidated_on_change(self, renderer):
         state1 = ScoreboardState(home_score=0)
@@ -188,7 +188,7 @@ class TestScoreboardRenderer:
         state = ScoreboardState(visible=False)
 
         result = renderer.composite_onto_frame(frame, state)
-        assert np.array_equal(result, frame)
+        np.testing.assert_array_equal(result, frame)
 
     def test_composite_on_different_size_frame(self, renderer):
         """Test compositing on a non-standard frame size."""
@@ -9,8 +9,8 @@ Verifies:
 
 import os
 import sys
-import time
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,6 +18,26 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from smoother import ExponentialSmoother, SnapAnimator, InputSmoother
 
 
+class FakeClock:
+    """Stands in for smoother's time module; only moves when advanced."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("smoother.time", fake)
+    return fake
+
+
 class TestExponentialSmoother:
     def test_initial_value(self):
         s = ExponentialSmoother(alpha=0.5, initial=10.0)
@@ -27,17 +47,13 @@ class TestExponentialSmoother:
         """Feed a step input (0 -> 100) and verify output ramps, not jumps."""
         s = ExponentialSmoother(alpha=0.15, initial=0.0)
 
-        values = []
-        for _ in range(30):
-            values.append(s.update(100.0))
+        values = s.filter(np.full(30, 100.0))
 
         # First value should be small (not 100)
         assert values[0] < 20, f"First smoothed value {values[0]} is too large"
 
         # Values should monotonically increase
-        for i in range(1, len(values)):
-            assert values[i] >= values[i-1], \
-                f"Not monotonic: values[{i}]={values[i]} < values[{i-1}]={values[i-1]}"
+        assert (np.diff(values) >= 0).all(), f"Not monotonic: {values}"
 
         # Should approach target after many iterations
         assert values[-1] > 90, f"Final value {values[-1]} didn't reach near target"
@@ -62,12 +78,11 @@ class TestExponentialSmoother:
 
     def test_smoothing_reduces_noise(self):
         """Verify that smoothing reduces the variance of noisy input."""
-        import numpy as np
         rng = np.random.RandomState(42)
         s = ExponentialSmoother(alpha=0.15, initial=50.0)
 
         raw_values = 50.0 + rng.randn(100) * 10
-        smoothed_values = [s.update(v) for v in raw_values]
+        smoothed_values = s.filter(raw_values)
 
         raw_std = np.std(raw_values)
         smoothed_std = np.std(smoothed_values)
@@ -76,6 +91,17 @@ class TestExponentialSmoother:
             f"Smoothed std ({smoothed_std:.2f}) >= raw std ({raw_std:.2f})"
 
 
+    def test_filter_matches_update(self):
+        """The batched filter should reproduce per-sample updates exactly."""
+        raw_values = np.linspace(-20.0, 80.0, 50)
+        streaming = ExponentialSmoother(alpha=0.3, initial=10.0)
+        batched = ExponentialSmoother(alpha=0.3, initial=10.0)
+
+        expected = [streaming.update(v) for v in raw_values]
+        np.testing.assert_allclose(batched.filter(raw_values), expected)
+        assert batched.value == pytest.approx(streaming.value)
+
+
 class TestSnapAnimator:
     def test_snap_starts_at_origin(self):
         snap = SnapAnimator(duration=0.5)
@@ -96,15 +122,11 @@ class TestSnapAnimator:
         snap = SnapAnimator(duration=0.5)
         snap.start(0, 0, 100, 0)
 
-        positions = []
-        for i in range(11):
-            t = i / 10.0
-            x, _ = snap.update_with_progress(t)
-            positions.append(x)
+        positions = np.array([snap.update_with_progress(t)[0]
+                              for t in np.linspace(0.0, 1.0, 11)])
 
         # Should be monotonically increasing
-        for i in range(1, len(positions)):
-            assert positions[i] >= positions[i-1]
+        assert (np.diff(positions) >= 0).all(), f"Not monotonic: {positions}"
 
         # Early progress should cover more distance (ease-out)
         first_half_distance = positions[5] - positions[0]
@@ -120,12 +142,12 @@ class TestSnapAnimator:
         snap.update_with_progress(1.0)
         assert snap.active is False
 
-    def test_snap_time_based(self):
+    def test_snap_time_based(self, clock):
         """Verify time-based animation completes after duration."""
         snap = SnapAnimator(duration=0.1)
         snap.start(0, 0, 100, 200)
 
-        time.sleep(0.15)
+        clock.advance(0.15)
 
         x, y, done = snap.update()
         assert done is True
@@ -148,10 +170,10 @@ class TestInputSmoother:
         smoother.start_snap(0, 0, 100, 200)
         assert smoother.is_snapping is True
 
-    def test_snap_position_after_completion(self):
+    def test_snap_position_after_completion(self, clock):
         smoother = InputSmoother(snap_duration=0.05)
         smoother.start_snap(0, 0, 100, 200)
-        time.sleep(0.1)
+        clock.advance(0.1)
         x, y, done = smoother.get_snap_position()
         assert done is True
         assert x == pytest.approx(100, abs=0.1)
@@ -11,6 +11,7 @@ Creates short synthetic video pairs with known overlap and verifies:
 import json
 import os
 import sys
+import threading
 
 import cv2
 import numpy as np
@@ -18,44 +19,62 @@ import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from stitch import stitch_frame, stitch_videos, load_calibration, get_video_info
+from stitch import (
+    stitch_frame,
+    stitch_frame_remap,
+    stitch_videos,
+    get_video_info,
+    open_capture,
+    output_frame_size,
+    precompute_remap,
+    compute_blend_weights,
+    timecode_to_seconds,
+    StitchContext,
+)
 from calibrate import calibrate
 
 
-def make_test_video_pair(tmp_path, num_frames=10, width=400, height=300,
-                         overlap_px=120, fps=30.0):
+def make_test_video_pair(tmp_path, num_frames=10, width=200, height=150,
+                         overlap_px=60, fps=30.0):
     """
     Create two short synthetic video files with known overlap.
+
+    The default 200x150 frames are enough for calibration to find matches
+    while keeping feature detection cheap.
     Returns left_path, right_path, and expected panorama width.
     """
     full_width = 2 * width - overlap_px
-    rng = np.random.RandomState(42)
+    rng = np.random.default_rng(42)
 
     # Create a base frame with distinctive features
-    base_frame = rng.randint(50, 200, (height, full_width, 3), dtype=np.uint8)
+    base_frame = rng.integers(50, 200, (height, full_width, 3), dtype=np.uint8)
 
     # Add shapes for visual features
     for _ in range(20):
-        cx = rng.randint(0, full_width)
-        cy = rng.randint(0, height)
-        r = rng.randint(10, 30)
-        color = tuple(int(c) for c in rng.randint(0, 256, 3))
+        cx = rng.integers(0, full_width)
+        cy = rng.integers(0, height)
+        r = rng.integers(10, 30)
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
         cv2.circle(base_frame, (cx, cy), r, color, -1)
 
     base_frame = cv2.GaussianBlur(base_frame, (5, 5), 1.0)
 
-    left_path = str(tmp_path / "left.mp4")
-    right_path = str(tmp_path / "right.mp4")
+    # Uncompressed I420 AVI: inputs are only decoded, and raw writes beat
+    # running the mp4v encoder over noisy frames
+    left_path = str(tmp_path / "left.avi")
+    right_path = str(tmp_path / "right.avi")
 
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    fourcc = cv2.VideoWriter_fourcc(*"I420")
     writer_left = cv2.VideoWriter(left_path, fourcc, fps, (width, height))
     writer_right = cv2.VideoWriter(right_path, fourcc, fps, (width, height))
 
-    for i in range(num_frames):
-        # Add slight variation per frame (simulates camera movement)
-        noise = rng.randint(-5, 6, base_frame.shape, dtype=np.int16)
-        frame = np.clip(base_frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    # Slight variation per frame (simulates camera movement), drawn for all
+    # frames at once
+    noise = rng.integers(-5, 6, (num_frames,) + base_frame.shape, dtype=np.int16)
+    noise += base_frame
+    frames = np.clip(noise, 0, 255, out=noise).astype(np.uint8)
 
+    for frame in frames:
         left_frame = frame[:, :width]
         right_frame = frame[:, (width - overlap_px):]
 
@@ -68,6 +87,41 @@ def make_test_video_pair(tmp_path, num_frames=10, width=400, height=300,
     return left_path, right_path, full_width
 
 
+@pytest.fixture(scope="module")
+def pair_calibration(tmp_path_factory, video_factory):
+    """
+    Calibrate the synthetic pair once for the module.
+
+    Every make_test_video_pair call renders the same seeded scene with the
+    same overlap, so this calibration applies to pairs of any length.
+    Returns (cal_data, cal_path).
+    """
+    left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=2)
+    cal_dir = tmp_path_factory.mktemp("cal")
+    cal_data = calibrate(
+        left_path, right_path,
+        cal_date="test",
+        output_dir=str(cal_dir),
+        frame_index=0,
+        overlap_fraction=0.4
+    )
+    return cal_data, str(cal_dir / "test_cal.json")
+
+
+class TestTimecodeToSeconds:
+    def test_frame_timecode(self):
+        assert timecode_to_seconds("01:02:03:15", fps=30.0) == pytest.approx(3723.5)
+
+    def test_drop_frame_separator(self):
+        assert timecode_to_seconds("00:00:10;06", fps=30.0) == pytest.approx(10.2)
+
+    def test_fractional_seconds(self):
+        assert timecode_to_seconds("00:01:02.250") == pytest.approx(62.25)
+
+    def test_malformed_returns_none(self):
+        assert timecode_to_seconds("not a timecode") is None
+
+
 class TestGetVideoInfo:
     def test_reads_video_metadata(self, tmp_path):
         path = str(tmp_path / "test.mp4")
@@ -83,20 +137,66 @@ class TestGetVideoInfo:
         assert abs(info["fps"] - 30.0) < 1.0
         assert info["frame_count"] == 5
 
+    def test_rewritten_file_is_probed_again(self, tmp_path):
+        path = str(tmp_path / "test.mp4")
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        for num_frames in (3, 6):
+            w = cv2.VideoWriter(path, fourcc, 30.0, (64, 48))
+            for _ in range(num_frames):
+                w.write(np.zeros((48, 64, 3), dtype=np.uint8))
+            w.release()
+            assert get_video_info(path)["frame_count"] == num_frames
+
+    def test_cached_info_is_a_copy(self, tmp_path):
+        path = str(tmp_path / "test.mp4")
+        w = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30.0, (64, 48))
+        w.write(np.zeros((48, 64, 3), dtype=np.uint8))
+        w.release()
+
+        get_video_info(path)["width"] = 0
+        assert get_video_info(path)["width"] == 64
+
+
+class TestOpenCapture:
+    @pytest.fixture
+    def options_seen(self, monkeypatch):
+        """Record OPENCV_FFMPEG_CAPTURE_OPTIONS as each VideoCapture opens."""
+        seen = []
+        real_capture = cv2.VideoCapture
+
+        def recording_capture(*args):
+            seen.append(os.environ.get("OPENCV_FFMPEG_CAPTURE_OPTIONS"))
+            return real_capture(*args)
+
+        monkeypatch.setattr(cv2, "VideoCapture", recording_capture)
+        return seen
+
+    def test_thread_option_scoped_to_open(self, video_factory, monkeypatch,
+                                          options_seen):
+        monkeypatch.delenv("OPENCV_FFMPEG_CAPTURE_OPTIONS", raising=False)
+        left_path, _, _ = video_factory(make_test_video_pair, num_frames=2)
+
+        open_capture(left_path).release()
+
+        assert options_seen[0] == f"threads;{os.cpu_count() or 1}"
+        assert "OPENCV_FFMPEG_CAPTURE_OPTIONS" not in os.environ
+
+    def test_user_options_win(self, video_factory, monkeypatch, options_seen):
+        monkeypatch.setenv("OPENCV_FFMPEG_CAPTURE_OPTIONS", "threads;2")
+        left_path, _, _ = video_factory(make_test_video_pair, num_frames=2)
+
+        open_capture(left_path).release()
+
+        assert options_seen[0] == "threads;2"
+        assert os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] == "threads;2"
+
 
 class TestStitchFrame:
-    def test_stitched_frame_has_correct_dimensions(self, tmp_path):
+    def test_stitched_frame_has_correct_dimensions(self, video_factory, pair_calibration):
         """Verify a single frame stitch produces correct canvas size."""
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=2)
-
-        # Run calibration
-        cal_data = calibrate(
-            left_path, right_path,
-            cal_date="test",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=2)
+
+        cal_data, _ = pair_calibration
 
         H = np.array(cal_data["homography"])
         canvas_w = cal_data["canvas_width"]
@@ -118,19 +218,13 @@ class TestStitchFrame:
 
         assert result.shape == (canvas_h, canvas_w, 3)
         # Canvas should be wider than either input
-        assert canvas_w > 400
+        assert canvas_w > 200
 
-    def test_no_black_seam_in_blend_region(self, tmp_path):
+    def test_no_black_seam_in_blend_region(self, video_factory, pair_calibration):
         """Verify the blend region doesn't have hard black edges."""
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=2)
-
-        cal_data = calibrate(
-            left_path, right_path,
-            cal_date="test",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=2)
+
+        cal_data, _ = pair_calibration
 
         H = np.array(cal_data["homography"])
 
@@ -154,12 +248,126 @@ class TestStitchFrame:
         # Sample a column in the blend region
         col = result[center_y - 20:center_y + 20, blend_mid]
         # At least some pixels should be non-black
-        assert col.sum() > 0, "Blend region center is all black"
+        assert col.any(), "Blend region center is all black"
+
+
+class TestStitchFrameRemap:
+    def test_scratch_buffers_match_fresh_allocation(self):
+        """Reused (dirty) scratch buffers produce the same frame as fresh ones."""
+        rng = np.random.RandomState(3)
+        frame_l = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        frame_r = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        H_adjusted = np.array([[1, 0, 140], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+        pre = precompute_remap(H_adjusted, 340, 120, 0, 0,
+                               120, 200, 120, 200, 140, 200)
+
+        expected = stitch_frame_remap(frame_l, frame_r, pre)
+
+        canvas = np.full((120, 340, 3), 77, dtype=np.uint8)
+        warped = np.full((120, 340, 3), 99, dtype=np.uint8)
+        result = stitch_frame_remap(frame_l, frame_r, pre,
+                                    canvas=canvas, warped_right=warped)
+
+        assert result is canvas
+        assert np.array_equal(result, expected)
+
+    @pytest.mark.parametrize("backend", ["numba", "aot"])
+    def test_compiled_kernel_matches_numpy_blend(self, backend):
+        """The fused Numba/AOT blend is bit-identical to the NumPy fallback."""
+        import stitch
+        if backend == "numba":
+            pytest.importorskip("numba")
+            kernel = stitch._blend_fill_kernel
+        else:
+            # Only present after `python build_kernels.py`
+            kernel = pytest.importorskip("stitch_kernels").blend_fill
+
+        rng = np.random.RandomState(5)
+        frame_l = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        frame_r = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        H_adjusted = np.array([[1, 0, 140], [0, 1, 3], [0, 0, 1]], dtype=np.float64)
+        pre = precompute_remap(H_adjusted, 340, 125, 0, 0,
+                               120, 200, 120, 200, 140, 200)
+
+        warped = cv2.remap(frame_r, pre["remap_x"], pre["remap_y"],
+                           cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        canvas_np = np.zeros((125, 340, 3), dtype=np.uint8)
+        canvas_np[:120, :200] = frame_l
+        canvas_nb = canvas_np.copy()
+
+        stitch._blend_fill(canvas_np, warped, pre)
+        kernel(canvas_nb, warped, *pre["blend_kernel_args"])
+
+        assert np.array_equal(canvas_nb, canvas_np)
+
+
+class TestStitchContext:
+    def test_rotates_output_canvases(self):
+        """Consecutive frames land in different ring canvases, same pixels."""
+        rng = np.random.RandomState(4)
+        frame_l = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        frame_r = rng.randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        H_adjusted = np.array([[1, 0, 140], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+        pre = precompute_remap(H_adjusted, 340, 120, 0, 0,
+                               120, 200, 120, 200, 140, 200)
+        ctx = StitchContext.create(H_adjusted, pre, ring_size=2)
+
+        first = ctx.stitch(frame_l, frame_r)
+        second = ctx.stitch(frame_l, frame_r)
+        third = ctx.stitch(frame_l, frame_r)
+
+        assert first is not second
+        assert third is first
+        assert np.array_equal(second, stitch_frame_remap(frame_l, frame_r, pre))
+
+    def test_default_ring_follows_pipeline_depth(self, monkeypatch):
+        """The default ring is sized from PIPELINE_DEPTH at call time."""
+        import stitch
+        monkeypatch.setattr(stitch, "PIPELINE_DEPTH", 3)
+        H_adjusted = np.array([[1, 0, 140], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+        pre = precompute_remap(H_adjusted, 340, 120, 0, 0,
+                               120, 200, 120, 200, 140, 200)
+
+        ctx = StitchContext.create(H_adjusted, pre)
+
+        assert len(ctx.canvas_ring) == 5
+
+
+class TestBlendWeights:
+    def test_weights_reproduce_remap_stitch(self):
+        """Weighted sum of placed-left and warped-right matches stitch_frame_remap."""
+        rng = np.random.RandomState(7)
+        frame_l = rng.randint(1, 256, (120, 200, 3), dtype=np.uint8)
+        frame_r = rng.randint(1, 256, (120, 200, 3), dtype=np.uint8)
+        H_adjusted = np.array([[1, 0, 140], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+        pre = precompute_remap(H_adjusted, 340, 120, 0, 0,
+                               120, 200, 120, 200, 140, 200)
+
+        expected = stitch_frame_remap(frame_l, frame_r, pre)
+
+        weight_left, weight_right = compute_blend_weights(pre)
+        canvas_left = np.zeros((120, 340, 3), dtype=np.float32)
+        canvas_left[:, :200] = frame_l
+        warped = cv2.remap(frame_r, pre["remap_x"], pre["remap_y"],
+                           cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        result = (canvas_left * weight_left[:, :, None]
+                  + warped.astype(np.float32) * weight_right[:, :, None])
+
+        assert np.abs(result - expected).max() <= 1.0
+        # Weights never overlap beyond a partition of unity
+        assert (weight_left + weight_right).max() <= 1.0 + 1e-6
 
 
 class TestStitchVideos:
-    def test_output_video_exists(self, tmp_path):
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=10)
+    @pytest.fixture(autouse=True)
+    def in_tmp_path(self, tmp_path, monkeypatch):
+        # stitch_videos auto-calibrates into ./calibrations; keep each test's
+        # files in its own tmp_path so parallel workers never share them
+        monkeypatch.chdir(tmp_path)
+
+    def test_output_video_exists(self, tmp_path, video_factory):
+        """Without a calibration, stitch_videos calibrates and saves one."""
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=10)
         output_path = str(tmp_path / "stitched.mp4")
 
         stitch_videos(
@@ -170,53 +378,59 @@ class TestStitchVideos:
 
         assert os.path.exists(output_path)
         assert os.path.getsize(output_path) > 0
+        assert os.path.exists(os.path.join("calibrations", "test-stitch_cal.json"))
 
-    def test_output_resolution_matches_calibration(self, tmp_path):
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=10)
+    def test_output_resolution_matches_calibration(self, tmp_path, video_factory,
+                                                   pair_calibration):
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=10)
+        cal_data, cal_path = pair_calibration
         output_path = str(tmp_path / "stitched.mp4")
 
         stitch_videos(
             left_path, right_path, output_path,
-            cal_date="test-res",
+            cal_path=cal_path,
             frame_offset=0
         )
 
         info = get_video_info(output_path)
-        # Load the calibration that was auto-created
-        cal_path = os.path.join("calibrations", "test-res_cal.json")
-        cal_data = load_calibration(cal_path)
+        assert (info["width"], info["height"]) == output_frame_size(
+            cal_data["canvas_width"], cal_data["canvas_height"])
+
+    @pytest.mark.parametrize("canvas_w, canvas_h", [(340, 150), (341, 151)])
+    def test_output_size_is_canvas_rounded_to_even(self, tmp_path, video_factory,
+                                                   pair_calibration,
+                                                   canvas_w, canvas_h):
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=2)
+        cal_data, _ = pair_calibration
+        cal = dict(cal_data, canvas_width=canvas_w, canvas_height=canvas_h)
+        output_path = str(tmp_path / "stitched.mp4")
 
-        assert info["width"] == cal_data["canvas_width"]
-        assert info["height"] == cal_data["canvas_height"]
+        stitch_videos(left_path, right_path, output_path, cal_data=cal)
 
-    def test_frame_count_matches_input(self, tmp_path):
+        info = get_video_info(output_path)
+        assert (info["width"], info["height"]) == (340, 150)
+
+    def test_frame_count_matches_input(self, tmp_path, video_factory, pair_calibration):
         num_frames = 10
-        left_path, right_path, _ = make_test_video_pair(
-            tmp_path, num_frames=num_frames
+        left_path, right_path, _ = video_factory(
+            make_test_video_pair, num_frames=num_frames
         )
+        _, cal_path = pair_calibration
         output_path = str(tmp_path / "stitched.mp4")
 
         stitch_videos(
             left_path, right_path, output_path,
-            cal_date="test-count",
+            cal_path=cal_path,
             frame_offset=0
         )
 
         info = get_video_info(output_path)
         assert info["frame_count"] == num_frames
 
-    def test_with_existing_calibration(self, tmp_path):
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=5)
+    def test_with_existing_calibration(self, tmp_path, video_factory, pair_calibration):
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=5)
 
-        # Pre-calibrate
-        cal_data = calibrate(
-            left_path, right_path,
-            cal_date="preexist",
-            output_dir=str(tmp_path / "cal"),
-            frame_index=0,
-            overlap_fraction=0.4
-        )
-        cal_path = str(tmp_path / "cal" / "preexist_cal.json")
+        _, cal_path = pair_calibration
 
         output_path = str(tmp_path / "stitched.mp4")
         stitch_videos(
@@ -229,8 +443,23 @@ class TestStitchVideos:
         info = get_video_info(output_path)
         assert info["frame_count"] == 5
 
-    def test_progress_callback(self, tmp_path):
-        left_path, right_path, _ = make_test_video_pair(tmp_path, num_frames=5)
+    def test_frame_offset_skips_leading_frames(self, tmp_path, video_factory, pair_calibration):
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=10)
+        _, cal_path = pair_calibration
+        output_path = str(tmp_path / "stitched.mp4")
+
+        stitch_videos(
+            left_path, right_path, output_path,
+            cal_path=cal_path,
+            frame_offset=3
+        )
+
+        info = get_video_info(output_path)
+        assert info["frame_count"] == 7
+
+    def test_progress_callback(self, tmp_path, video_factory, pair_calibration):
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=5)
+        _, cal_path = pair_calibration
         output_path = str(tmp_path / "stitched.mp4")
 
         progress_log = []
@@ -240,7 +469,7 @@ class TestStitchVideos:
 
         stitch_videos(
             left_path, right_path, output_path,
-            cal_date="test-progress",
+            cal_path=cal_path,
             frame_offset=0,
             progress_callback=on_progress
         )
@@ -248,6 +477,46 @@ class TestStitchVideos:
         assert len(progress_log) == 5
         assert progress_log[-1][0] == 5
 
+    def test_writer_error_is_raised(self, tmp_path, video_factory,
+                                    pair_calibration, monkeypatch):
+        """A failing encoder surfaces as an exception instead of a hang."""
+        import stitch
+
+        class FailingWriter:
+            def isOpened(self):
+                return True
+
+            def write(self, frame):
+                raise RuntimeError("encoder failed")
+
+            def release(self):
+                pass
+
+        monkeypatch.setattr(stitch, "open_writer",
+                            lambda *args, **kwargs: FailingWriter())
+        # A shallow pipeline fills up after a couple of frames, so the old
+        # blocking put() would have hung well before the input ran out
+        monkeypatch.setattr(stitch, "PIPELINE_DEPTH", 1)
+
+        left_path, right_path, _ = video_factory(make_test_video_pair, num_frames=10)
+        _, cal_path = pair_calibration
+        outcome = {}
+
+        def run():
+            try:
+                stitch_videos(left_path, right_path, str(tmp_path / "stitched.avi"),
+                              cal_path=cal_path)
+            except Exception as e:
+                outcome["error"] = e
+
+        # Bound the wait so a hang is reported as a failure, not a stuck test
+        runner = threading.Thread(target=run, daemon=True)
+        runner.start()
+        runner.join(timeout=30)
+
+        assert not runner.is_alive(), "stitch_videos hung after the writer failed"
+        assert str(outcome.get("error")) == "encoder failed"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
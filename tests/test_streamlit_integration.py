@@ -75,10 +75,9 @@ class TestConfigIntegration:
 
 
 class TestStageFileDetection:
-    def test_all_stages_detected(self, tmp_path):
+    def test_all_stages_detected(self, tmp_path, monkeypatch):
         """Verify check_stage_files detects files via session state."""
-        import streamlit as st
-        from app import check_stage_files
+        import app
 
         # Create temp files
         stitched = str(tmp_path / "stitched.mp4")
@@ -89,63 +88,78 @@ class TestStageFileDetection:
             with open(path, "w") as f:
                 f.write("test")
 
-        st.session_state["stitched_path"] = stitched
-        st.session_state["log_path"] = log
-        st.session_state["broadcast_path"] = broadcast
+        # check_stage_files only reads session_state as a mapping, so a plain
+        # dict stands in without touching Streamlit's runtime state
+        monkeypatch.setattr(app.st, "session_state", {
+            "stitched_path": stitched,
+            "log_path": log,
+            "broadcast_path": broadcast,
+        })
 
-        stages = check_stage_files("test-date")
+        stages = app.check_stage_files("test-date")
         assert stages["stitched"] is True
         assert stages["log"] is True
         assert stages["broadcast"] is True
 
-        # Clean up
-        for key in ["stitched_path", "log_path", "broadcast_path"]:
-            del st.session_state[key]
+
+def make_flow_pair(tmp_path, num_frames=20, width=400, height=300, overlap=120):
+    """Create an overlapping left/right video pair for the data-flow test."""
+    full_width = 2 * width - overlap
+    rng = np.random.default_rng(42)
+    base = rng.integers(50, 200, (height, full_width, 3), dtype=np.uint8)
+    for _ in range(15):
+        cx, cy = rng.integers(0, full_width), rng.integers(0, height)
+        cv2.circle(base, (cx, cy), 15, tuple(int(c) for c in rng.integers(0, 256, 3)), -1)
+    base = cv2.GaussianBlur(base, (5, 5), 1.0)
+
+    left_path = str(tmp_path / "left.avi")
+    right_path = str(tmp_path / "right.avi")
+    fourcc = cv2.VideoWriter_fourcc(*"I420")
+    wl = cv2.VideoWriter(left_path, fourcc, 30.0, (width, height))
+    wr = cv2.VideoWriter(right_path, fourcc, 30.0, (width, height))
+    noise = rng.integers(-3, 4, (num_frames,) + base.shape, dtype=np.int16)
+    noise += base
+    frames = np.clip(noise, 0, 255, out=noise).astype(np.uint8)
+    for frame in frames:
+        wl.write(frame[:, :width])
+        wr.write(frame[:, (width - overlap):])
+    wl.release()
+    wr.release()
+    return left_path, right_path
+
+
+@pytest.fixture(scope="module")
+def stitched_flow_video(tmp_path_factory, video_factory):
+    """Stage 1 (calibrate + stitch) of the data-flow test, run once per module."""
+    from calibrate import calibrate
+    from stitch import stitch_videos
+
+    left_path, right_path = video_factory(make_flow_pair)
+    tmp_path = tmp_path_factory.mktemp("flow")
+
+    calibrate(left_path, right_path, cal_date="flow-test",
+              output_dir=str(tmp_path / "cal"), frame_index=0,
+              overlap_fraction=0.4)
+    cal_path = str(tmp_path / "cal" / "flow-test_cal.json")
+
+    stitched_path = str(tmp_path / "stitched.mp4")
+    stitch_videos(left_path, right_path, stitched_path,
+                  cal_path=cal_path, frame_offset=0)
+    return stitched_path
 
 
 class TestDataFlowIntegration:
-    def test_stitch_to_interactive_to_render(self, tmp_path):
+    def test_stitch_to_interactive_to_render(self, tmp_path, stitched_flow_video):
         """End-to-end: stitch output → interactive session → render input.
 
         Tests that the data formats are compatible across all three stages.
         """
-        from calibrate import calibrate
-        from stitch import stitch_videos, get_video_info
+        from stitch import get_video_info
         from interactive import InteractiveViewer
         from render import render_broadcast
 
-        # Create test video pair
-        width, height, overlap = 400, 300, 120
-        full_width = 2 * width - overlap
-        rng = np.random.RandomState(42)
-        base = rng.randint(50, 200, (height, full_width, 3), dtype=np.uint8)
-        for _ in range(15):
-            cx, cy = rng.randint(0, full_width), rng.randint(0, height)
-            cv2.circle(base, (cx, cy), 15, tuple(int(c) for c in rng.randint(0, 256, 3)), -1)
-        base = cv2.GaussianBlur(base, (5, 5), 1.0)
-
-        left_path = str(tmp_path / "left.mp4")
-        right_path = str(tmp_path / "right.mp4")
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        wl = cv2.VideoWriter(left_path, fourcc, 30.0, (width, height))
-        wr = cv2.VideoWriter(right_path, fourcc, 30.0, (width, height))
-        for i in range(20):
-            noise = rng.randint(-3, 4, base.shape, dtype=np.int16)
-            frame = np.clip(base.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-            wl.write(frame[:, :width])
-            wr.write(frame[:, (width - overlap):])
-        wl.release()
-        wr.release()
-
-        # Stage 1: Stitch
-        cal_data = calibrate(left_path, right_path, cal_date="flow-test",
-                            output_dir=str(tmp_path / "cal"), frame_index=0,
-                            overlap_fraction=0.4)
-        cal_path = str(tmp_path / "cal" / "flow-test_cal.json")
-
-        stitched_path = str(tmp_path / "stitched.mp4")
-        stitch_videos(left_path, right_path, stitched_path,
-                      cal_path=cal_path, frame_offset=0)
+        # Stage 1: Stitch (shared fixture)
+        stitched_path = stitched_flow_video
         assert os.path.exists(stitched_path)
 
         # Stage 2: Interactive (headless)
@@ -179,15 +193,10 @@ class TestDataFlowIntegration:
         assert os.path.exists(broadcast_path)
 
         # Verify output
-        cap = cv2.VideoCapture(broadcast_path)
-        assert cap.isOpened()
-        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fc = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        cap.release()
-        assert w == 640
-        assert h == 360
-        assert fc == 20
+        info = get_video_info(broadcast_path)
+        assert info["width"] == 640
+        assert info["height"] == 360
+        assert info["frame_count"] == 20
 
 
 if __name__ == "__main__":
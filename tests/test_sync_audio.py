@@ -8,6 +8,7 @@ Creates synthetic WAV files with known offsets and verifies:
 """
 
 import os
+import shutil
 import sys
 
 import numpy as np
@@ -16,50 +17,68 @@ from scipy.io import wavfile
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sync_audio import load_audio, cross_correlate_offset, sync_audio
+from render import _get_ffmpeg_path, mux_audio
+from sync_audio import extract_audio_pcm, load_audio, cross_correlate_offset, sync_audio
 
 
 SAMPLE_RATE = 16000
 FRAME_DURATION = 1.0 / 30  # ~33.3ms per frame at 30fps
 
 
-def make_test_wavs(tmp_path, offset_seconds: float, duration: float = 10.0,
-                   sample_rate: int = SAMPLE_RATE):
+def make_crowd_signal(duration: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
     """
-    Create two WAV files where the right channel is offset by a known amount.
+    Synthesize float32 "crowd" audio in [-1, 1].
 
     The signal is a mix of tones and noise to simulate ambient crowd sound.
     """
-    rng = np.random.RandomState(42)
-    total_samples = int((duration + abs(offset_seconds) + 1) * sample_rate)
-
-    # Create a "crowd noise" signal: pink noise + occasional bursts
-    t = np.arange(total_samples) / sample_rate
-    signal = rng.randn(total_samples).astype(np.float32) * 0.3
-
-    # Add some tonal components (whistle-like)
-    signal += 0.2 * np.sin(2 * np.pi * 440 * t).astype(np.float32)
-    signal += 0.15 * np.sin(2 * np.pi * 880 * t).astype(np.float32)
-
-    # Add random bursts (like crowd cheering)
-    for _ in range(5):
-        start = rng.randint(0, total_samples - sample_rate)
-        burst_len = rng.randint(sample_rate // 4, sample_rate)
-        signal[start:start + burst_len] += rng.randn(burst_len).astype(np.float32) * 0.5
+    rng = np.random.default_rng(42)
+    total_samples = int(duration * sample_rate)
+
+    # White noise + tonal components (whistle-like), accumulated into one
+    # float32 buffer
+    phase = (2 * np.pi / sample_rate) * np.arange(total_samples)
+    tone = np.empty(total_samples, dtype=np.float32)
+    signal = rng.standard_normal(total_samples, dtype=np.float32)
+    signal *= 0.3
+    signal += 0.2 * np.sin(440 * phase, out=tone)
+    signal += 0.15 * np.sin(880 * phase, out=tone)
+
+    # Add random bursts (like crowd cheering), all scattered in one pass
+    starts = rng.integers(0, total_samples - sample_rate, 5)
+    lens = rng.integers(sample_rate // 4, sample_rate, 5)
+    within = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+    idx = np.repeat(starts, lens) + within
+    np.add.at(signal, idx, 0.5 * rng.standard_normal(idx.size, dtype=np.float32))
 
     # Clip to safe range
-    signal = np.clip(signal, -1.0, 1.0)
+    return np.clip(signal, -1.0, 1.0, out=signal)
+
 
-    # Create left and right by slicing with offset
+def offset_pair(signal: np.ndarray, offset_seconds: float, duration: float,
+                sample_rate: int = SAMPLE_RATE):
+    """Slice left/right views of signal where right is offset by offset_seconds."""
     offset_samples = int(offset_seconds * sample_rate)
     num_samples = int(duration * sample_rate)
 
     if offset_samples >= 0:
-        left_signal = signal[:num_samples]
-        right_signal = signal[offset_samples:offset_samples + num_samples]
+        left = signal[:num_samples]
+        right = signal[offset_samples:offset_samples + num_samples]
     else:
-        right_signal = signal[:num_samples]
-        left_signal = signal[-offset_samples:-offset_samples + num_samples]
+        right = signal[:num_samples]
+        left = signal[-offset_samples:-offset_samples + num_samples]
+    return left, right
+
+
+def make_test_wavs(tmp_path, signal: np.ndarray, offset_seconds: float,
+                   duration: float = 10.0, sample_rate: int = SAMPLE_RATE):
+    """
+    Create two WAV files where the right channel is offset by a known amount.
+
+    Both channels are sliced from signal, which must cover
+    duration + abs(offset_seconds) seconds.
+    """
+    left_signal, right_signal = offset_pair(signal, offset_seconds, duration,
+                                            sample_rate)
 
     # Convert to int16 WAV
     left_int16 = (left_signal * 32767).astype(np.int16)
@@ -74,6 +93,32 @@ def make_test_wavs(tmp_path, offset_seconds: float, duration: float = 10.0,
     return left_path, right_path
 
 
+@pytest.fixture
+def ffmpeg_on_path(tmp_path, monkeypatch):
+    """
+    Make a bare `ffmpeg` resolvable for extract_audio_pcm, falling back to the
+    imageio-ffmpeg binary render uses when there is no system ffmpeg.
+    """
+    if shutil.which("ffmpeg"):
+        return
+    try:
+        ffmpeg = _get_ffmpeg_path()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+    if not os.path.isabs(ffmpeg):
+        pytest.skip("ffmpeg not available")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    os.symlink(ffmpeg, bin_dir / "ffmpeg")
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+
+
+@pytest.fixture(scope="module")
+def crowd_signal():
+    """18 s of crowd audio: long enough for every offset/duration case."""
+    return make_crowd_signal(18.0)
+
+
 class TestLoadAudio:
     def test_loads_int16_wav(self, tmp_path):
         data = np.array([0, 16384, -16384, 32767], dtype=np.int16)
@@ -96,51 +141,79 @@ class TestLoadAudio:
         assert audio.ndim == 1
 
 
+class TestExtractAudioPcm:
+    @pytest.mark.usefixtures("ffmpeg_on_path")
+    def test_muxed_tone_decodes_to_mono_float32(self, tmp_path, make_video):
+        """A tone muxed into a 1 s clip comes back as mono float32 PCM."""
+        video_path = make_video(num_frames=30)
+        t = np.arange(SAMPLE_RATE * 2) / SAMPLE_RATE
+        tone = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+        wav_path = str(tmp_path / "tone.wav")
+        wavfile.write(wav_path, SAMPLE_RATE, np.column_stack([tone, tone]))
+        muxed = mux_audio(video_path, wav_path, str(tmp_path / "muxed.mp4"))
+        assert muxed != video_path, "mux_audio fell back to the video-only file"
+
+        rate = 8000
+        pcm = extract_audio_pcm(muxed, sample_rate=rate)
+
+        assert pcm.dtype == np.float32
+        assert pcm.ndim == 1
+        # -shortest trims the audio to the 1 s video, give or take AAC framing
+        assert abs(len(pcm) - rate) < 0.1 * rate, f"Got {len(pcm)} samples"
+        assert np.abs(pcm).max() <= 1.0
+        assert np.sqrt(np.mean(pcm ** 2)) > 0.1
+
+    @pytest.mark.usefixtures("ffmpeg_on_path")
+    def test_video_without_audio_raises(self, make_video):
+        with pytest.raises(RuntimeError, match="audio extraction failed"):
+            extract_audio_pcm(make_video())
+
+
 class TestCrossCorrelation:
-    def test_zero_offset(self, tmp_path):
-        left_path, right_path = make_test_wavs(tmp_path, offset_seconds=0.0)
-        _, left = load_audio(left_path)
-        _, right = load_audio(right_path)
+    @pytest.mark.parametrize("offset_seconds, duration", [
+        (0.0, 10.0),
+        (0.5, 10.0),    # Right camera started 0.5s earlier (right leads)
+        (-0.3, 10.0),   # Right camera started 0.3s later (right lags)
+        (2.0, 15.0),
+    ])
+    def test_detects_offset(self, crowd_signal, offset_seconds, duration):
+        left, right = offset_pair(crowd_signal, offset_seconds, duration)
         offset = cross_correlate_offset(left, right, SAMPLE_RATE)
-        assert abs(offset) < FRAME_DURATION, f"Expected ~0s, got {offset:.4f}s"
+        assert abs(offset - offset_seconds) < FRAME_DURATION, \
+            f"Expected ~{offset_seconds}s, got {offset:.4f}s"
+
+    def test_low_frequency_dominated_signal(self):
+        """PHAT whitening keeps the peak sharp for heavily tilted spectra."""
+        rng = np.random.RandomState(7)
+        # Brown noise: energy concentrated at low frequencies
+        signal = np.cumsum(rng.randn(12 * SAMPLE_RATE)).astype(np.float32)
+        offset_samples = int(0.4 * SAMPLE_RATE)
+        left = signal[:10 * SAMPLE_RATE]
+        right = signal[offset_samples:offset_samples + 10 * SAMPLE_RATE]
 
-    def test_positive_offset_half_second(self, tmp_path):
-        """Right camera started 0.5s earlier (right leads)."""
-        left_path, right_path = make_test_wavs(tmp_path, offset_seconds=0.5)
-        _, left = load_audio(left_path)
-        _, right = load_audio(right_path)
-        offset = cross_correlate_offset(left, right, SAMPLE_RATE)
-        assert abs(offset - 0.5) < FRAME_DURATION, \
-            f"Expected ~0.5s, got {offset:.4f}s"
-
-    def test_negative_offset(self, tmp_path):
-        """Right camera started 0.3s later (right lags)."""
-        left_path, right_path = make_test_wavs(tmp_path, offset_seconds=-0.3)
-        _, left = load_audio(left_path)
-        _, right = load_audio(right_path)
         offset = cross_correlate_offset(left, right, SAMPLE_RATE)
-        assert abs(offset - (-0.3)) < FRAME_DURATION, \
-            f"Expected ~-0.3s, got {offset:.4f}s"
-
-    def test_large_offset(self, tmp_path):
-        """Test with a 2-second offset."""
-        left_path, right_path = make_test_wavs(tmp_path, offset_seconds=2.0,
-                                                duration=15.0)
-        _, left = load_audio(left_path)
-        _, right = load_audio(right_path)
-        offset = cross_correlate_offset(left, right, SAMPLE_RATE)
-        assert abs(offset - 2.0) < FRAME_DURATION, \
-            f"Expected ~2.0s, got {offset:.4f}s"
+        assert abs(offset - 0.4) < FRAME_DURATION, \
+            f"Expected ~0.4s, got {offset:.4f}s"
 
 
 class TestSyncAudioEndToEnd:
-    def test_sync_from_wav_files(self, tmp_path):
+    def test_sync_from_wav_files(self, tmp_path, crowd_signal):
         """Full pipeline with WAV file inputs."""
-        left_path, right_path = make_test_wavs(tmp_path, offset_seconds=0.75)
+        left_path, right_path = make_test_wavs(tmp_path, crowd_signal,
+                                               offset_seconds=0.75)
         offset = sync_audio(left_path, right_path, sample_rate=SAMPLE_RATE)
         assert abs(offset - 0.75) < FRAME_DURATION, \
             f"Expected ~0.75s, got {offset:.4f}s"
 
+    def test_sync_decimated_with_refinement(self, tmp_path, crowd_signal):
+        """16 kHz WAVs are correlated at 4 kHz, then refined at 16 kHz."""
+        left_path, right_path = make_test_wavs(tmp_path, crowd_signal,
+                                               offset_seconds=-0.6)
+        offset = sync_audio(left_path, right_path, sample_rate=4000,
+                            refine_sample_rate=SAMPLE_RATE)
+        assert abs(offset - (-0.6)) < 1.0 / SAMPLE_RATE, \
+            f"Expected ~-0.6s, got {offset:.5f}s"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])